@@ -1,70 +1,217 @@
-from google import genai
-from dotenv import load_dotenv
+import logging
 import os
 import time
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Iterator, Optional, Tuple, Union
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from llm_cache import get_default_cache
+from extractive import ExtractiveSummarizer
+from prompt_compiler import PromptCompiler
+from summarizer_backends import ExtractiveBackend, SummarizerBackend, create_backend
+from metrics import LLM_REQUESTS, LLM_RETRIES, LLM_SLIDE_TOKENS, LLM_TOKENS, PROMPT_TRUNCATIONS, SLIDES, span
+
+logger = logging.getLogger(__name__)
 
 class Summarizer:
-    def __init__(self):
-        load_dotenv()
-        GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-        if not GEMINI_API_KEY:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-        
+    def __init__(self, backend: Optional[Union[str, SummarizerBackend]] = None):
+        """backend is a SummarizerBackend or its name ('gemini', 'mock', 'extractive');
+        the default comes from SUMMARIZER_BACKEND and whether GEMINI_API_KEY is set"""
         try:
-            self.client = genai.Client(api_key=GEMINI_API_KEY)
+            self.backend = backend if isinstance(backend, SummarizerBackend) else create_backend(backend)
+        except ValueError:
+            raise
         except Exception as e:
-            raise RuntimeError(f"Failed to initialize Gemini client: {str(e)}")
+            raise RuntimeError(f"Failed to initialize summarizer backend: {str(e)}")
+        # Fallback slides, and every slide in extractive (fast) mode, where it is
+        # the backend's own engine so its fingerprint describes the summarizer in use
+        if isinstance(self.backend, ExtractiveBackend):
+            self.extractive = self.backend.engine
+        else:
+            self.extractive = ExtractiveSummarizer()
+        # System instruction and compact per-chunk prompts under GEMINI_INPUT_TOKEN_BUDGET
+        self.prompts = PromptCompiler()
         
+        self.MODEL = "gemini-2.5-flash"
+        # Bump whenever create_prompt_for_chunk or response parsing changes
+        self.PROMPT_VERSION = 2
         self.TEMPERATURE = 0.7
         self.MAX_TOKENS = 300
+        self.MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+        # Batched mode packs several chunks into one request, bounded by an input token budget
+        self.BATCH_MODE = os.getenv("GEMINI_BATCH_MODE", "0") == "1"
+        self.BATCH_INPUT_TOKENS = int(os.getenv("GEMINI_BATCH_INPUT_TOKENS", "4000"))
+        self.MAX_BATCH_SIZE = int(os.getenv("GEMINI_MAX_BATCH_SIZE", "8"))
+        self.BATCH_ITEM_OVERHEAD_TOKENS = 60
+        # Mock replies must never be served for real Gemini prompts
+        self.cache = get_default_cache() if self.backend.name == 'gemini' else None
+        self.last_fallback_count = 0
+        self.last_fallback_indices = set()
 
-    def generate_slides(self, structured_chunks: list, page_count: int = 0) -> list:
-        slides = []
+    def generate_slides(self, structured_chunks: list, page_count: int = 0, on_progress=None,
+                        max_concurrency: int = None, batch_mode: bool = None) -> list:
+        structured_chunks = self.select_chunks(structured_chunks, page_count)
+        total = len(structured_chunks)
+        slides = [None] * total
+        if on_progress:
+            on_progress(0, total)
+        
+        for done, (i, slide) in enumerate(self.iter_slides(structured_chunks, max_concurrency, batch_mode), start=1):
+            slides[i] = slide
+            if on_progress:
+                on_progress(done, total)
+        
+        ratio = f"{len(slides) / page_count:.2f}" if page_count > 0 else 'n/a'
+        logger.info("Generated %d slides (%s per page, %d fallback)", len(slides), ratio, self.last_fallback_count)
+        if self.cache is not None:
+            logger.debug("LLM cache: %s", self.cache.stats())
         
-        if page_count > 0:
-            target_slides = self._calculate_target_slides(page_count)
-            max_chunks = min(len(structured_chunks), target_slides)
-            print(f"\n📊 ADAPTIVE SLIDE COUNT:")
-            print(f"  PDF Pages: {page_count}")
-            print(f"  Target Slides: {target_slides}")
-            print(f"  Available Chunks: {len(structured_chunks)}")
-            print(f"  Processing Chunks: {max_chunks}")
-        else:
-            max_chunks = min(len(structured_chunks), 30)
-            print(f"\n⚠️  No page count provided, using default limit: {max_chunks}")
+        return slides
+
+    def select_chunks(self, structured_chunks: list, page_count: int = 0) -> list:
+        """Limit the chunks to the adaptive slide count for the document"""
+        max_chunks = min(len(structured_chunks), self.chunk_budget(page_count))
+        if page_count <= 0:
+            logger.debug("No page count provided, using default limit: %d", max_chunks)
         
         if len(structured_chunks) > max_chunks:
-            print(f"\n⚠️  WARNING: Too many chunks ({len(structured_chunks)}). Limiting to first {max_chunks} chunks.")
+            logger.debug("Limiting %d chunks to the first %d (%d pages)", len(structured_chunks), max_chunks, page_count)
             structured_chunks = structured_chunks[:max_chunks]
+        return structured_chunks
+
+    def chunk_budget(self, page_count: int = 0) -> int:
+        """How many chunks select_chunks keeps for a document of page_count pages"""
+        return self._calculate_target_slides(page_count) if page_count > 0 else 30
+
+    def iter_slides(self, structured_chunks: list, max_concurrency: int = None,
+                    batch_mode: bool = None, corpus: Optional[list] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (chunk index, slide) as soon as each slide is ready.
+
+        With more than one request in flight, slides arrive in completion order.
+        corpus is the document's full chunk list when only some of its chunks
+        are summarized; extractive term weights are fitted on it.
+        """
+        self.last_fallback_count = 0
+        self.last_fallback_indices = set()
+        total = len(structured_chunks)
+        # Document-level term weights for extractive and fallback slides
+        self.extractive.fit(chunk.get('text', '') for chunk in (structured_chunks if corpus is None else corpus))
+        if not self.backend.uses_llm:
+            for i, chunk in enumerate(structured_chunks):
+                SLIDES.inc(source='extractive')
+                yield i, self.extractive.summarize(chunk)
+            return
+        use_batches = self.BATCH_MODE if batch_mode is None else batch_mode
+        if use_batches:
+            units = self._pack_batches(structured_chunks)
+        else:
+            units = [[i] for i in range(total)]
+        workers = max(1, min(self.MAX_CONCURRENCY if max_concurrency is None else max_concurrency, len(units)))
+        logger.debug("Processing %d chunks in %d requests (%d in flight)", total, len(units), workers)
         
-        print(f"\n=== PROCESSING {len(structured_chunks)} CHUNKS ===")
-        
-        for i, chunk in enumerate(structured_chunks):
-            print(f"\nProcessing chunk {i+1}/{len(structured_chunks)}")
-            try:
-                prompt = self.create_prompt_for_chunk(chunk)
-                raw_response = self.call_gemini_api(prompt)
+        if workers == 1:
+            results = (self._generate_unit(structured_chunks, unit, total) for unit in units)
+            executor = None
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gemini')
+            futures = [executor.submit(self._generate_unit, structured_chunks, unit, total) for unit in units]
+            results = (future.result() for future in as_completed(futures))
+        try:
+            for unit_results in results:
+                for i, slide, used_fallback in unit_results:
+                    if used_fallback:
+                        self.last_fallback_count += 1
+                        self.last_fallback_indices.add(i)
+                    yield i, slide
+        finally:
+            if executor is not None:
+                # Don't start queued requests if the consumer went away early
+                executor.shutdown(cancel_futures=True)
+
+    def prompt_fingerprint(self) -> Dict[str, Any]:
+        if not self.backend.uses_llm:
+            return self.backend.fingerprint()
+        return {
+            **self.backend.fingerprint(),
+            'model': self.MODEL,
+            'prompt_version': self.PROMPT_VERSION,
+            **self.prompts.fingerprint(),
+            'temperature': self.TEMPERATURE,
+            'max_tokens': self.MAX_TOKENS,
+            'batch_input_tokens': self.BATCH_INPUT_TOKENS if self.BATCH_MODE else None
+        }
+
+    def _generate_unit(self, chunks: List[Dict[str, Any]], indices: List[int], total: int) -> List[Tuple[int, Dict[str, Any], bool]]:
+        if len(indices) == 1:
+            i = indices[0]
+            return [(i, *self._generate_slide_for_chunk(chunks[i], i, total))]
+        return self._generate_batch(chunks, indices, total)
+
+    def _generate_batch(self, chunks: List[Dict[str, Any]], indices: List[int], total: int) -> List[Tuple[int, Dict[str, Any], bool]]:
+        """Summarize several chunks in one request; items that fail are retried on their own"""
+        parsed = {}
+        try:
+            prompt = self.create_batch_prompt([chunks[i] for i in indices])
+            raw_response = self.call_gemini_api(
+                prompt, max_tokens=self.MAX_TOKENS * len(indices),
+                system_instruction=self.prompts.system_instruction(batch=True), slides=len(indices),
+                validate=lambda raw: len(self.parse_batch_response(raw, len(indices))) == len(indices))
+            with span('parse', chunks=len(indices)):
+                parsed = self.parse_batch_response(raw_response, len(indices))
+        except Exception as e:
+            logger.warning("Batch request for chunks %s failed: %s", [i + 1 for i in indices], e)
+        
+        results = []
+        for position, i in enumerate(indices):
+            slide = parsed.get(position)
+            if slide is not None:
+                SLIDES.inc(source='llm')
+                results.append((i, slide, False))
+            else:
+                logger.debug("Batch item for chunk %d missing or invalid, retrying individually", i + 1)
+                results.append((i, *self._generate_slide_for_chunk(chunks[i], i, total)))
+        return results
+
+    def _pack_batches(self, chunks: List[Dict[str, Any]]) -> List[List[int]]:
+        """Greedily group consecutive chunks so each request stays under the input token budget"""
+        budget = self.BATCH_INPUT_TOKENS - self._estimate_tokens(self.prompts.system_instruction(batch=True))
+        # Items longer than this are cut by the compiler anyway
+        text_budget = self.prompts.text_budget(batch=True)
+        batches = []
+        current, used = [], 0
+        for i, chunk in enumerate(chunks):
+            cost = min(self._estimate_tokens(chunk.get('text', '')), text_budget) + self.BATCH_ITEM_OVERHEAD_TOKENS
+            if current and (used + cost > budget or len(current) >= self.MAX_BATCH_SIZE):
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _estimate_tokens(self, text: str) -> int:
+        return self.prompts.estimate_tokens(text)
+
+    def _generate_slide_for_chunk(self, chunk: Dict[str, Any], i: int, total: int) -> Tuple[Dict[str, Any], bool]:
+        """Summarize a single chunk, falling back to an extractive slide on any failure.
+
+        Returns the slide and whether the fallback was used.
+        """
+        try:
+            prompt = self.create_prompt_for_chunk(chunk)
+            raw_response = self.call_gemini_api(prompt, validate=self._is_valid_slide_response,
+                                                system_instruction=self.prompts.system_instruction())
+            with span('parse', chunks=1):
                 slide = self.parse_ai_response(raw_response)
-                if self.validate_slide_quality(slide):
-                    slides.append(slide)
-                    print(f"✅ Slide {i+1} generated successfully")
-                else:
-                    fallback = self.generate_fallback_slide(chunk)
-                    slides.append(fallback)
-                    print(f"⚠️  Using fallback slide for chunk {i+1}")
-            except Exception as e:
-                fallback = self.generate_fallback_slide(chunk)
-                slides.append(fallback)
-                print(f"❌ Error processing chunk {i+1}: {str(e)}")
-        
-        print(f"\n=== FINAL RESULT ===")
-        print(f"Total slides generated: {len(slides)}")
-        print(f"Slide-to-page ratio: {len(slides)}/{page_count} = {len(slides)/page_count:.2f} slides per page")
-        print("=" * 50)
-        
-        return slides
+                valid = self.validate_slide_quality(slide)
+            if valid:
+                SLIDES.inc(source='llm')
+                return slide, False
+            logger.debug("Slide for chunk %d/%d failed validation, using fallback", i + 1, total)
+        except Exception as e:
+            logger.warning("Error processing chunk %d/%d: %s", i + 1, total, e)
+        SLIDES.inc(source='fallback')
+        return self.generate_fallback_slide(chunk), True
     
     def _calculate_target_slides(self, page_count: int) -> int:
         if page_count <= 0:
@@ -79,141 +226,69 @@ class Summarizer:
         else:
             return min(50, page_count // 5)
     def create_prompt_for_chunk(self, chunk_data: dict) -> str:
-        """Creates a tailored prompt based on chunk content and metadata"""
-        
-        chunk_text = chunk_data.get('text', '')
-        slide_type = chunk_data.get('slide_type', 'content')
-        estimated_topic = chunk_data.get('estimated_topic', 'general')
-        
-        # Extract key themes and concepts from the text
-        key_concepts = self._extract_key_concepts(chunk_text)
-        
-        # Create context-aware instructions
-        slide_instructions = self._get_slide_type_instructions(slide_type)
-        
-        prompt = f"""You are an expert presentation designer. Create a professional slide from the following content.
-
-CONTENT TO PROCESS:
-{chunk_text}
-
-SLIDE TYPE: {slide_type}
-TOPIC AREA: {estimated_topic}
-KEY CONCEPTS: {', '.join(key_concepts)}
-
-INSTRUCTIONS:
-{slide_instructions}
-
-REQUIREMENTS:
-1. Create a specific, descriptive title (NOT generic like "Summary" or "Overview")
-2. Generate 3-5 clear, concise bullet points
-3. Each bullet should be one complete idea (not fragments)
-4. Focus on the most important information
-5. Use active voice when possible
-6. Ensure logical flow between bullets
-
-OUTPUT FORMAT (JSON):
-{{
-    "title": "Specific descriptive title that captures the main concept",
-    "bullets": [
-        "First key point with specific details",
-        "Second key point with specific details", 
-        "Third key point with specific details"
-    ]
-}}
-
-Generate the slide now:"""
+        """Per-chunk prompt; the shared instructions go in self.prompts.system_instruction()"""
+        prompt, truncated = self.prompts.compile(chunk_data)
+        if truncated:
+            PROMPT_TRUNCATIONS.inc()
+        return prompt
 
+    def create_batch_prompt(self, chunks: List[Dict[str, Any]]) -> str:
+        """Prompt asking for a JSON array with a slide per chunk, in order"""
+        prompt, truncated = self.prompts.compile_batch(chunks)
+        if truncated:
+            PROMPT_TRUNCATIONS.inc(truncated)
         return prompt
 
-    def _extract_key_concepts(self, text: str) -> List[str]:
-        """Extract key concepts and terms from the text"""
-        # Remove common words and extract meaningful terms
-        words = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', text)
-        
-        # Filter for likely important concepts
-        concepts = []
-        for word in words:
-            if (len(word) > 3 and 
-                word not in ['The', 'This', 'That', 'They', 'There', 'These', 'Those'] and
-                not re.match(r'^\d+$', word)):
-                concepts.append(word)
-        
-        # Return top 5 most frequent unique concepts
-        from collections import Counter
-        concept_counts = Counter(concepts)
-        return [concept for concept, _ in concept_counts.most_common(5)]
+    def _is_valid_slide_response(self, raw_response: str) -> bool:
+        try:
+            return self.validate_slide_quality(self.parse_ai_response(raw_response))
+        except ValueError:
+            return False
 
-    def _get_slide_type_instructions(self, slide_type: str) -> str:
-        """Get specific instructions based on slide type"""
-        
-        instructions = {
-            'title': """
-- Create an engaging title slide that introduces the main topic
-- Include the primary subject and key themes
-- Bullets should outline what will be covered or main objectives
-- Focus on setting context and expectations""",
-            
-            'introduction': """
-- Provide background context and setting
-- Explain why this topic is important
-- Include relevant historical context if applicable
-- Set up the main narrative or argument""",
-            
-            'content': """
-- Focus on the main ideas and supporting details
-- Organize information hierarchically (most to least important)
-- Include specific facts, data, or examples
-- Ensure each bullet represents a distinct concept""",
-            
-            'methodology': """
-- Explain approaches, methods, or processes
-- Break down complex procedures into clear steps
-- Include tools, techniques, or frameworks used
-- Focus on "how" rather than "what" """,
-            
-            'results': """
-- Present key findings, outcomes, or achievements
-- Include specific data, statistics, or evidence
-- Highlight the most significant results first
-- Show cause-and-effect relationships where relevant""",
-            
-            'conclusion': """
-- Summarize the main points or findings
-- Draw connections between different concepts
-- Include implications or significance
-- End with key takeaways or next steps""",
-            
-            'data': """
-- Present quantitative information clearly
-- Include specific numbers, percentages, or statistics
-- Explain what the data means or implies
-- Compare different data points if relevant"""
-        }
+    def call_gemini_api(self, prompt: str, max_tokens: int = None, validate: Callable[[str], bool] = None,
+                        system_instruction: Optional[str] = None, slides: int = 1) -> str:
+        """Send one prompt, going through the LLM cache.
+
+        Only replies that pass validate (when given) are cached, and a cached
+        reply that fails it is dropped and requested again, so a malformed or
+        refused answer is never replayed on later runs.
+        """
+        max_tokens = max_tokens or self.MAX_TOKENS
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(prompt, self.MODEL, self.TEMPERATURE, max_tokens,
+                                            system_instruction=system_instruction)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if validate is None or validate(cached):
+                    LLM_REQUESTS.inc(outcome='cache_hit')
+                    return cached
+                self.cache.delete(cache_key)
         
-        return instructions.get(slide_type, instructions['content'])
-    def call_gemini_api(self, prompt: str) -> str:
         MAX_RETRIES = 3
         RETRY_COUNT = 0
         
         while RETRY_COUNT < MAX_RETRIES:
+            if RETRY_COUNT:
+                LLM_RETRIES.inc()
             try:
-                response = self.client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    prompt=prompt,
-                    temperature=self.TEMPERATURE,
-                    max_output_tokens=self.MAX_TOKENS
-                )
-                
-                response_text = response.text
-                
-                print(f"\n=== AI RESPONSE ===")
-                print(f"Response Length: {len(response_text)} characters")
-                print(f"Response Preview: {response_text[:300]}...")
-                print("=" * 50)
+                with span('llm_call', attempt=RETRY_COUNT + 1) as attributes:
+                    response = self.backend.generate_content(
+                        model=self.MODEL,
+                        contents=prompt,
+                        config={'temperature': self.TEMPERATURE, 'max_output_tokens': max_tokens,
+                                'system_instruction': system_instruction}
+                    )
+                    response_text = response.text
+                    self._record_usage(response, attributes, slides)
+                LLM_REQUESTS.inc(outcome='ok')
                 
+                if cache_key is not None and response_text and (validate is None or validate(response_text)):
+                    self.cache.put(cache_key, response_text)
                 return response_text
                 
             except Exception as e:
+                LLM_REQUESTS.inc(outcome='error')
                 if "rate_limit" in str(e).lower() or "quota" in str(e).lower():
                     time.sleep(2 ** RETRY_COUNT)
                     RETRY_COUNT += 1
@@ -226,6 +301,21 @@ Generate the slide now:"""
         
         raise Exception("Max retries exceeded")
 
+    def _record_usage(self, response: Any, attributes: Dict[str, Any], slides: int = 1):
+        usage = getattr(response, 'usage_metadata', None)
+        input_tokens = getattr(usage, 'prompt_token_count', None) or 0
+        output_tokens = getattr(usage, 'candidates_token_count', None) or 0
+        cached_tokens = getattr(usage, 'cached_content_token_count', None) or 0
+        LLM_TOKENS.inc(input_tokens, kind='input')
+        LLM_TOKENS.inc(output_tokens, kind='output')
+        LLM_TOKENS.inc(cached_tokens, kind='cached')
+        if usage is not None:
+            # A batched request's tokens are shared evenly by its slides
+            for _ in range(slides):
+                LLM_SLIDE_TOKENS.observe(input_tokens / slides, kind='input')
+                LLM_SLIDE_TOKENS.observe(output_tokens / slides, kind='output')
+        attributes.update(input_tokens=input_tokens, output_tokens=output_tokens, cached_tokens=cached_tokens)
+
     def parse_ai_response(self, raw_response: str) -> Dict[str, Any]:
         if not isinstance(raw_response, str):
             raise ValueError("raw_response must be a string")
@@ -255,6 +345,48 @@ Generate the slide now:"""
         
         raise ValueError("Could not parse AI response into slide format")
 
+    def parse_batch_response(self, raw_response: str, expected: int) -> Dict[int, Dict[str, Any]]:
+        """Parse a batched response into {item position: slide}, keeping only valid slides.
+
+        Tolerates code fences, surrounding prose and individually malformed
+        objects; items that can't be recovered are simply absent.
+        """
+        if not isinstance(raw_response, str):
+            raise ValueError("raw_response must be a string")
+        
+        import json
+        items = None
+        text = re.sub(r'^```(?:json)?\s*|\s*```$', '', raw_response.strip())
+        start, end = text.find('['), text.rfind(']')
+        if start != -1 and end > start:
+            try:
+                items = json.loads(text[start:end + 1])
+            except json.JSONDecodeError:
+                items = None
+        if not isinstance(items, list):
+            # Salvage whatever flat objects are still well-formed
+            items = []
+            for match in re.finditer(r'\{[^{}]*\}', text):
+                try:
+                    items.append(json.loads(match.group(0)))
+                except json.JSONDecodeError:
+                    continue
+        
+        slides = {}
+        for position, item in enumerate(items):
+            if not isinstance(item, dict) or "title" not in item or not isinstance(item.get("bullets"), list):
+                continue
+            item_id = item.get("id", position)
+            if not isinstance(item_id, int) or not 0 <= item_id < expected or item_id in slides:
+                continue
+            slide = {
+                "title": self._clean_text(item["title"]),
+                "bullets": [self._clean_text(bullet) for bullet in item["bullets"]]
+            }
+            if self.validate_slide_quality(slide):
+                slides[item_id] = slide
+        return slides
+
     def validate_slide_quality(self, slide: Dict[str, Any]) -> bool:
         if not isinstance(slide, dict):
             return False
@@ -287,89 +419,8 @@ Generate the slide now:"""
         return valid_bullets >= 1
 
     def generate_fallback_slide(self, chunk_data: Dict[str, Any]) -> Dict[str, Any]:
-        text = chunk_data.get("text", "")
-        slide_type = chunk_data.get("slide_type", "content")
-        estimated_topic = chunk_data.get("estimated_topic", "general")
-        
-        # Create more specific titles based on content analysis
-        title = self._generate_contextual_title(text, slide_type, estimated_topic)
-        
-        # Extract meaningful bullet points from text
-        bullets = self._extract_meaningful_bullets(text)
-        
-        if len(bullets) < 1:
-            bullets = ["Key information from source material", "Please refer to original document for details"]
-        
-        return {
-            "title": title,
-            "bullets": bullets[:5]  # Limit to 5 bullets
-        }
-
-    def _generate_contextual_title(self, text: str, slide_type: str, topic: str) -> str:
-        """Generate a meaningful title based on content analysis"""
-        
-        # Look for key phrases that could be titles
-        sentences = [s.strip() for s in text.split('.') if s.strip()]
-        if not sentences:
-            return f"{topic.title()} Information"
-        
-        first_sentence = sentences[0]
-        
-        # Look for proper nouns and important concepts
-        import re
-        capitalized_words = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', first_sentence)
-        
-        if capitalized_words:
-            # Use the most significant capitalized phrase
-            longest_phrase = max(capitalized_words, key=len)
-            
-            if slide_type == "title":
-                return f"{longest_phrase}: Overview"
-            elif slide_type == "conclusion":
-                return f"Key Outcomes: {longest_phrase}"
-            elif slide_type == "introduction":
-                return f"Understanding {longest_phrase}"
-            else:
-                return longest_phrase
-        
-        # Fallback to topic-based titles
-        if slide_type == "title":
-            return f"{topic.title()}: Introduction"
-        elif slide_type == "conclusion":
-            return f"{topic.title()}: Key Takeaways"
-        elif slide_type == "methodology":
-            return f"{topic.title()}: Approach and Methods"
-        elif slide_type == "results":
-            return f"{topic.title()}: Findings and Results"
-        else:
-            # Extract first meaningful phrase
-            words = first_sentence.split()[:8]
-            return ' '.join(words) if len(' '.join(words)) > 10 else f"{topic.title()} Overview"
-
-    def _extract_meaningful_bullets(self, text: str) -> List[str]:
-        """Extract meaningful bullet points from text"""
-        sentences = [s.strip() for s in text.split('.') if s.strip() and len(s.strip()) > 15]
-        
-        bullets = []
-        for sentence in sentences[:6]:  # Process up to 6 sentences
-            # Clean up the sentence
-            cleaned = sentence.strip()
-            if len(cleaned) > 20 and len(cleaned.split()) >= 4:
-                # Remove common prefixes
-                cleaned = re.sub(r'^(The|This|That|These|Those|It|There)\s+', '', cleaned)
-                bullets.append(cleaned)
-        
-        # If we don't have enough bullets, try splitting longer sentences
-        if len(bullets) < 2 and sentences:
-            for sentence in sentences[:3]:
-                if len(sentence) > 100:  # Long sentence, try to split
-                    parts = sentence.split(',')
-                    for part in parts:
-                        part = part.strip()
-                        if len(part) > 20 and len(bullets) < 5:
-                            bullets.append(part)
-        
-        return bullets
+        """Extractive slide for a chunk the LLM couldn't summarize"""
+        return self.extractive.summarize(chunk_data)
 
     def _clean_text(self, text: str) -> str:
         if not isinstance(text, str):
@@ -2,44 +2,122 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 
 app = Flask(__name__)
-app.config['MAX_CONTENT_LENGTh'] = 50 * 1024 * 1024
+app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024
 CORS(app)
 import os
-from flask import request
+import io
+import json
+import logging
+import re
+import threading
+from flask import Response, request, send_file, stream_with_context
 from werkzeug.utils import secure_filename
-from pdf_processor import PDFProcessor
-from ai_summarizer import Summarizer
-from pptx_generator import PPTXGenerator
+from pipeline import SlidePipeline
+from pdf_processor import parse_page_range, resolve_page_range
+from jobs import JobManager, QueueFullError
+from artifact_store import get_artifact_store
+from pptx_generator import PPTX_MIMETYPE
+from ingest import IngestRequest
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
+from lazy_imports import warm_up
+
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'),
+                    format='%(asctime)s %(levelname)s %(name)s: %(message)s')
 
 # Configure upload folder and allowed extensions
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 ALLOWED_EXTENSIONS = {'pdf'}
+ARTIFACT_ID_RE = re.compile(r'[0-9a-f]{64}')
+
+# Uploads are hashed and buffered as they arrive; only large ones spill into UPLOAD_FOLDER
+IngestRequest.spill_dir = UPLOAD_FOLDER
+app.request_class = IngestRequest
+
+job_manager = JobManager()
+
+# Heavy modules load on first use; set SLIDESYNTH_WARM_UP=1 to load them in the
+# background at startup so the first upload doesn't pay for the imports
+if os.getenv('SLIDESYNTH_WARM_UP', '0') == '1':
+    threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def requested_backend():
+    """mode=fast (form field or query string) builds the deck extractively, without the LLM"""
+    mode = request.values.get('mode', 'default')
+    if mode not in ('default', 'fast'):
+        raise ValueError(f"Unknown mode {mode!r}, expected 'default' or 'fast'")
+    return 'extractive' if mode == 'fast' else None
+
+def requested_lineage(filename):
+    """lineage_id (form field or query string) ties revisions of a document together; defaults to the filename"""
+    lineage_id = request.values.get('lineage_id', '').strip()
+    if len(lineage_id) > 200:
+        raise ValueError("lineage_id must be at most 200 characters")
+    return lineage_id or filename
+
+def requested_page_range():
+    """pages (form field or query string) limits the deck to a 1-based range like '5-40', '5-' or '7'"""
+    return parse_page_range(request.values.get('pages', ''))
+
+def check_page_range(upload, page_range):
+    """Reject a range that starts past the last page before the upload is queued"""
+    if page_range is None:
+        return
+    try:
+        document = upload.open_document()
+    except Exception:
+        # Not a readable PDF; the job reports that
+        return
+    with document:
+        resolve_page_range(document.page_count, page_range)
+
 @app.route('/api/health')
 def health():
     return jsonify({"status": 200})
 
+@app.route('/api/metrics')
+def metrics():
+    """Stage latencies and pipeline counters in the Prometheus text format"""
+    return Response(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
 @app.route('/api/download-pptx/<filename>')
 def download_pptx(filename):
+    """Serve a generated deck by artifact id (?artifact=), with ETag and Range support.
+
+    The id is the SHA-256 of the deck, so responses never change and may be
+    cached for good by browsers and CDNs. <filename> only names the download.
+    """
+    artifact_id = request.args.get('artifact', '')
+    if not ARTIFACT_ID_RE.fullmatch(artifact_id):
+        return jsonify({'error': 'PPTX file not found'}), 404
     try:
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        pptx_path = os.path.join(temp_dir, f"{filename}_slides.pptx")
-        
-        if os.path.exists(pptx_path):
-            from flask import send_file
-            return send_file(
-                pptx_path,
-                as_attachment=True,
-                download_name=f"{filename}_slides.pptx",
-                mimetype='application/vnd.openxmlformats-officedocument.presentationml.presentation'
-            )
+        store = get_artifact_store()
+        path = store.local_path(artifact_id)
+        if path is not None:
+            source = path
         else:
-            return jsonify({'error': 'PPTX file not found'}), 404
+            data = store.get(artifact_id)
+            if data is None:
+                return jsonify({'error': 'PPTX file not found'}), 404
+            source = io.BytesIO(data)
+        response = send_file(
+            source,
+            as_attachment=True,
+            download_name=f"{secure_filename(filename)}_slides.pptx",
+            mimetype=PPTX_MIMETYPE,
+            etag=artifact_id,
+            conditional=True,
+            max_age=365 * 24 * 3600
+        )
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+    except FileNotFoundError:
+        # Evicted between the lookup and the send
+        return jsonify({'error': 'PPTX file not found'}), 404
     except Exception as e:
         return jsonify({'error': f'Download failed: {str(e)}'}), 500
 
@@ -53,71 +131,120 @@ def upload_pdf():
         return jsonify({'error': 'No selected file'}), 400
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        save_path = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(save_path)
-        # Process the PDF
         try:
-            processor = PDFProcessor()
-            summarizer = Summarizer()
-            raw = processor.extract_text_from_doc(save_path)
-            page_count = processor.get_page_count(save_path)
-            chunks = processor.chunk_text(raw)
-            structured_chunks = processor.clean_and_structure_chunks(chunks)
-            
-            print(f"\n=== CHUNK ANALYSIS ===")
-            print(f"Raw text length: {len(raw)} characters")
-            print(f"PDF pages: {page_count}")
-            print(f"Initial chunks: {len(chunks)}")
-            print(f"Structured chunks: {len(structured_chunks)}")
-            
-            if structured_chunks:
-                print(f"\nFirst chunk sample:")
-                first_chunk = structured_chunks[0]
-                for key, value in first_chunk.items():
-                    if isinstance(value, str) and len(value) > 100:
-                        print(f"  {key}: {value[:100]}...")
-                    else:
-                        print(f"  {key}: {value}")
-            
-            slides = summarizer.generate_slides(structured_chunks, page_count)
-            
-            print(f"\n=== PDF PROCESSING RESULTS ===")
-            print(f"Filename: {filename}")
-            print(f"PDF Pages: {page_count}")
-            print(f"Total chunks: {len(structured_chunks)}")
-            print(f"Total slides generated: {len(slides)}")
-            print(f"Slide-to-page ratio: {len(slides)}/{page_count} = {len(slides)/page_count:.2f} slides per page")
-            print(f"\n=== FIRST 3 SLIDES ===")
-            for i, slide in enumerate(slides[:3]):
-                print(f"Slide {i+1}:")
-                print(f"  Title: {slide.get('title', 'N/A')}")
-                print(f"  Bullets: {slide.get('bullets', [])}")
-                print()
-            
-            if len(slides) > 3:
-                print(f"... and {len(slides) - 3} more slides")
-            print("=" * 50)
-            
-            pptx_generator = PPTXGenerator()
-            pptx_path = pptx_generator.create_presentation(slides, filename.replace('.pdf', ''))
-            
-            print(f"\n=== PPTX GENERATION ===")
-            print(f"PPTX file created: {pptx_path}")
-            print("=" * 50)
-            
-        except Exception as e:
-            os.remove(save_path)
-            return jsonify({'error': f'Processing failed: {str(e)}'}), 500
-        os.remove(save_path)
+            backend = requested_backend()
+            lineage_id = requested_lineage(filename)
+            page_range = requested_page_range()
+            check_page_range(file.stream, page_range)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        # The job outlives the request, so it takes over the upload buffer
+        upload = file.stream
+        upload.detach()
+
+        def work(job):
+            pipeline = SlidePipeline(summarizer_backend=backend)
+            return pipeline.run(upload, filename, on_progress=job.report_progress,
+                                lineage_id=lineage_id, page_range=page_range)
+
+        def cleanup():
+            upload.release()
+
+        try:
+            job = job_manager.submit(filename, work, cleanup)
+        except QueueFullError as e:
+            cleanup()
+            return jsonify({'error': str(e)}), 503
         return jsonify({
-            'success': True,
-            'filename': filename,
-            'total_chunks': len(structured_chunks),
-            'total_slides': len(slides),
-            'slides': slides,
-            'pptx_path': pptx_path
-        })
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f'/api/jobs/{job.id}'
+        }), 202
     return jsonify({'error': 'Invalid file'}), 400
 
+@app.route('/api/stream-slides', methods=['POST'])
+def stream_slides():
+    """Run the pipeline as a job and stream its events as they happen.
+
+    The job goes through the same bounded JobManager pool as /api/upload-pdf,
+    so this returns 503 when the queue is full. Server-Sent Events by default;
+    ?format=jsonl returns one JSON object per line.
+    """
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file part'}), 400
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'error': 'No selected file'}), 400
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file'}), 400
+
+    filename = secure_filename(file.filename)
+    try:
+        backend = requested_backend()
+        lineage_id = requested_lineage(filename)
+        page_range = requested_page_range()
+        check_page_range(file.stream, page_range)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    upload = file.stream
+    upload.detach()
+    as_jsonl = request.args.get('format') == 'jsonl'
+
+    def format_event(event, data):
+        if as_jsonl:
+            return json.dumps({'event': event, **data}) + '\n'
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    def work(job):
+        events = SlidePipeline(summarizer_backend=backend).stream(upload, filename, lineage_id, page_range)
+        try:
+            for event, data in events:
+                # Stops the pipeline (and its queued Gemini calls) if the client went away
+                job.check_cancelled()
+                if event == 'progress':
+                    job.report_progress(data['stage'], data['done'], data['total'])
+                job.publish(event, data)
+                if event == 'done':
+                    return data
+        finally:
+            events.close()
+        raise RuntimeError('Pipeline finished without a result')
+
+    def cleanup():
+        upload.release()
+
+    try:
+        job = job_manager.submit(filename, work, cleanup, stream=True)
+    except QueueFullError as e:
+        cleanup()
+        return jsonify({'error': str(e)}), 503
+
+    def generate():
+        try:
+            yield format_event('job', {'job_id': job.id, 'status_url': f'/api/jobs/{job.id}'})
+            for item in job.iter_events():
+                if item is None:
+                    # Keep proxies from timing out while the job waits in the queue
+                    if not as_jsonl:
+                        yield ": keep-alive\n\n"
+                    continue
+                yield format_event(*item)
+        finally:
+            if not job.finished:
+                job.cancel()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson' if as_jsonl else 'text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,187 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from llm_cache import DEFAULT_CACHE_DIR
+
+class ArtifactBackend:
+    """Where ArtifactStore keeps artifact bytes; subclass for object storage etc."""
+
+    def read(self, artifact_id: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def write(self, artifact_id: str, data: bytes):
+        raise NotImplementedError
+
+    def exists(self, artifact_id: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, artifact_id: str):
+        raise NotImplementedError
+
+    def touch(self, artifact_id: str):
+        """Mark the artifact as used now (for TTL and LRU eviction)"""
+        raise NotImplementedError
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """(last_used, size, artifact_id) for every stored artifact"""
+        raise NotImplementedError
+
+    def local_path(self, artifact_id: str) -> Optional[str]:
+        """A filesystem path to serve the artifact from, if the backend has one"""
+        return None
+
+class LocalDirBackend(ArtifactBackend):
+    """One file per artifact in a directory, with mtime as last use"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, artifact_id: str) -> str:
+        return os.path.join(self.root, artifact_id)
+
+    def read(self, artifact_id: str) -> Optional[bytes]:
+        try:
+            with open(self._path(artifact_id), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def write(self, artifact_id: str, data: bytes):
+        # Write to a temp file and rename so concurrent readers never see a partial artifact
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(artifact_id))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def exists(self, artifact_id: str) -> bool:
+        return os.path.exists(self._path(artifact_id))
+
+    def delete(self, artifact_id: str):
+        try:
+            os.remove(self._path(artifact_id))
+        except OSError:
+            pass
+
+    def touch(self, artifact_id: str):
+        try:
+            os.utime(self._path(artifact_id))
+        except OSError:
+            pass
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.root):
+            try:
+                stat = os.stat(self._path(name))
+            except OSError:
+                continue
+            # Leave other writers' in-flight temp files alone unless they are stale
+            if name.endswith('.tmp') and stat.st_mtime > now - 3600:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def local_path(self, artifact_id: str) -> Optional[str]:
+        return self._path(artifact_id)
+
+BACKENDS: Dict[str, Callable[[str], ArtifactBackend]] = {'local': LocalDirBackend}
+
+def register_backend(name: str, factory: Callable[[str], ArtifactBackend]):
+    """Make a backend selectable with ARTIFACT_BACKEND=name; factory gets ARTIFACT_DIR"""
+    BACKENDS[name] = factory
+
+class ArtifactStore:
+    """Generated files (decks) addressed by the SHA-256 of their content.
+
+    Identical decks share one entry no matter which upload produced them, and
+    an id never changes meaning, so it doubles as a strong ETag. Entries unused
+    for longer than the TTL are dropped, then the least recently used ones
+    until the store fits in max_bytes.
+    """
+
+    def __init__(self, backend: Optional[ArtifactBackend] = None, ttl_seconds: Optional[int] = None,
+                 max_bytes: Optional[int] = None, prune_interval: Optional[int] = None):
+        if backend is None:
+            root = os.getenv('ARTIFACT_DIR', os.path.join(DEFAULT_CACHE_DIR, 'artifacts'))
+            backend = BACKENDS[os.getenv('ARTIFACT_BACKEND', 'local')](root)
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv('ARTIFACT_TTL', str(24 * 3600)))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv('ARTIFACT_MAX_BYTES', str(512 * 1024 * 1024)))
+        self.prune_interval = prune_interval if prune_interval is not None else int(os.getenv('ARTIFACT_PRUNE_INTERVAL', '300'))
+        self.evictions = 0
+        self._last_prune = 0.0
+        self._prune_lock = threading.Lock()
+
+    @staticmethod
+    def artifact_id(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def put(self, data: bytes) -> str:
+        artifact_id = self.artifact_id(data)
+        if self.backend.exists(artifact_id):
+            self.backend.touch(artifact_id)
+        else:
+            self.backend.write(artifact_id, data)
+        if time.time() - self._last_prune >= self.prune_interval:
+            self.prune()
+        return artifact_id
+
+    def contains(self, artifact_id: str) -> bool:
+        return self.backend.exists(artifact_id)
+
+    def get(self, artifact_id: str) -> Optional[bytes]:
+        data = self.backend.read(artifact_id)
+        if data is not None:
+            self.backend.touch(artifact_id)
+        return data
+
+    def local_path(self, artifact_id: str) -> Optional[str]:
+        """Path of a stored artifact on a local backend, refreshing its last use"""
+        path = self.backend.local_path(artifact_id)
+        if path is None or not os.path.exists(path):
+            return None
+        self.backend.touch(artifact_id)
+        return path
+
+    def stats(self) -> Dict[str, int]:
+        entries = self.backend.entries()
+        return {'artifacts': len(entries), 'bytes': sum(size for _, size, _ in entries),
+                'evictions': self.evictions}
+
+    def prune(self):
+        """Remove artifacts unused for longer than the TTL, then the least recently used until under max_bytes"""
+        with self._prune_lock:
+            now = time.time()
+            self._last_prune = now
+            cutoff = now - self.ttl_seconds if self.ttl_seconds else None
+            entries = sorted(self.backend.entries())
+            total_bytes = sum(size for _, size, _ in entries)
+            for last_used, size, artifact_id in entries:
+                if (cutoff is None or last_used >= cutoff) and total_bytes <= self.max_bytes:
+                    break
+                self.backend.delete(artifact_id)
+                self.evictions += 1
+                total_bytes -= size
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+def get_artifact_store() -> ArtifactStore:
+    """Process-wide artifact store configured from ARTIFACT_* environment variables"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ArtifactStore()
+            _default_store.prune()
+        return _default_store
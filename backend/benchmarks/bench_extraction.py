@@ -0,0 +1,60 @@
+"""Compare the old LangChain PyMuPDFLoader path with PDFProcessor.extract_document.
+
+Usage: python benchmarks/bench_extraction.py [path/to.pdf] [repeats]
+"""
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from pdf_processor import PDFProcessor
+
+DEFAULT_PDF = os.path.join(BACKEND_DIR, '..', 'public', 'documents', 'test_1.pdf')
+
+def legacy_extract(path):
+    import fitz
+    from langchain_community.document_loaders import PyMuPDFLoader
+    docs = PyMuPDFLoader(path).load()
+    text = '\n\n'.join([doc.page_content for doc in docs])
+    with fitz.open(path) as doc:
+        page_count = len(doc)
+    return text, page_count
+
+def timed(fn, path):
+    start = time.perf_counter()
+    result = fn(path)
+    return time.perf_counter() - start, result
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+if __name__ == '__main__':
+    path = os.path.normpath(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PDF)
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    processor = PDFProcessor()
+
+    try:
+        import langchain_community.document_loaders  # noqa: F401 - import cost is not measured
+        candidates = {'direct': processor.extract_document, 'legacy': legacy_extract}
+    except ImportError:
+        print("langchain_community not installed, timing the direct path only")
+        candidates = {'direct': processor.extract_document}
+
+    # Interleave runs so both paths see the same cache and CPU frequency conditions
+    timings = {name: [] for name in candidates}
+    results = {}
+    for _ in range(repeats):
+        for name, fn in candidates.items():
+            elapsed, results[name] = timed(fn, path)
+            timings[name].append(elapsed)
+
+    text, page_count = results['direct']
+    print(f"{os.path.basename(path)}: {page_count} pages, {len(text)} chars, median of {repeats} runs")
+    print(f"  direct fitz (single open): {median(timings['direct']) * 1000:8.2f} ms")
+    if 'legacy' in candidates:
+        print(f"  LangChain loader + reopen: {median(timings['legacy']) * 1000:8.2f} ms")
+        print(f"  speedup: {median(timings['legacy']) / median(timings['direct']):.2f}x, "
+              f"identical output: {results['legacy'] == results['direct']}")
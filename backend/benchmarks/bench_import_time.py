@@ -0,0 +1,62 @@
+"""Cold import time of the Flask app, from `python -X importtime`.
+
+Imports `app` in fresh interpreters and reports the median cumulative
+import time plus the heavy modules seen in one run. Pass a git revision to
+also measure that revision's backend (exported to a temp dir with
+`git archive`) for a before/after comparison.
+
+Usage: python benchmarks/bench_import_time.py [baseline_rev] [repeats]
+"""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+
+_LINE_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def import_profile(backend_dir):
+    """Return {module: cumulative microseconds} for one cold `import app`"""
+    # Keep the measured imports from creating cache directories in the exported tree
+    env = dict(os.environ, PYTHONPATH=backend_dir, DOCUMENT_CACHE_ENABLED='0')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=backend_dir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    profile = {}
+    for match in _LINE_RE.finditer(result.stderr):
+        profile[match.group(4)] = int(match.group(2))
+    return profile
+
+def measure(backend_dir, repeats):
+    profiles = [import_profile(backend_dir) for _ in range(repeats)]
+    totals = sorted(profile['app'] for profile in profiles)
+    return totals[len(totals) // 2], profiles[-1]
+
+def report(label, total, profile):
+    print(f"{label}: import app {total / 1000:.0f} ms (median)")
+    heavy = ('google.genai', 'nltk', 'fitz', 'pptx', 'numpy', 'flask', 'pipeline')
+    for name in heavy:
+        if name in profile:
+            print(f"    {name:<14} {profile[name] / 1000:8.0f} ms")
+
+def export_revision(rev, target):
+    archive = subprocess.run(['git', 'archive', rev, 'backend'], cwd=REPO_DIR, capture_output=True, check=True)
+    subprocess.run(['tar', '-x', '-C', target], input=archive.stdout, check=True)
+    return os.path.join(target, 'backend')
+
+if __name__ == '__main__':
+    baseline = sys.argv[1] if len(sys.argv) > 1 else None
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    current_total, current_profile = measure(BACKEND_DIR, repeats)
+    if baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline_total, baseline_profile = measure(export_revision(baseline, tmp), repeats)
+        report(f"baseline {baseline}", baseline_total, baseline_profile)
+    report('working tree', current_total, current_profile)
+    if baseline:
+        print(f"speedup: {baseline_total / current_total:.1f}x")
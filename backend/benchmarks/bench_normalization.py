@@ -0,0 +1,82 @@
+"""Microbenchmark for chunk text normalization.
+
+Runs the pre-compiled, fused Util.clean_text and Util.is_meaningful_content
+against the previous one-re.sub-per-rule implementation over every chunk
+text in backend/tests/test1.txt, and checks that the outputs are identical.
+
+Usage: python benchmarks/bench_normalization.py [fixture] [repeats]
+"""
+import ast
+import os
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from pdf_processor import Util
+
+DEFAULT_FIXTURE = os.path.join(BACKEND_DIR, 'tests', 'test1.txt')
+
+def legacy_clean(text):
+    text = re.sub(r'(\w)-\s+(\w)', r'\1\2', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+    text = text.strip()
+    replacements = {
+        'aforementioned': 'previous', 'thus': 'therefore', 'hence': 'so',
+        'whilst': 'while', 'utilise': 'use', 'demonstrate': 'show',
+        'elucidate': 'explain', 'commence': 'begin', 'terminate': 'end'
+    }
+    for formal, casual in replacements.items():
+        text = re.sub(rf'\b{formal}\b', casual, text, flags=re.IGNORECASE)
+    text = re.sub(r'\([^)]*\d{4}[^)]*\)', '', text)
+    text = re.sub(r'\[\d+\]', '', text)
+    text = re.sub(r'\(see [^)]+\)', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+def legacy_is_meaningful(chunk):
+    if not chunk or len(chunk.strip()) < 50:
+        return False
+    if len(re.sub(r'[^\w]', '', chunk)) < 10:
+        return False
+    words = chunk.split()
+    if len(words) < 5:
+        return False
+    if sum(1 for word in words if len(word.strip()) == 1) / len(words) > 0.3:
+        return False
+    if chunk.count('(') + chunk.count('[') + chunk.count(')') > len(chunk) * 0.15:
+        return False
+    for pattern in [r'^\d+$', r'^[A-Z\s]+$', r'^\s*\.+\s*$', r'^\s*-+\s*$',
+                    r'^Table \d+', r'^Figure \d+', r'^Page \d+', r'^\d+$']:
+        if re.match(pattern, chunk.strip()):
+            return False
+    return True
+
+def run(clean, is_meaningful, texts):
+    return [(cleaned, is_meaningful(cleaned)) for cleaned in map(clean, texts)]
+
+def median_time(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2], result
+
+if __name__ == '__main__':
+    fixture = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FIXTURE
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    with open(fixture, encoding='utf-8') as f:
+        texts = [chunk['text'] for chunk in ast.literal_eval(f.read())]
+    util = Util()
+
+    legacy_time, legacy = median_time(lambda: run(legacy_clean, legacy_is_meaningful, texts), repeats)
+    fused_time, fused = median_time(lambda: run(util.clean_text, util.is_meaningful_content, texts), repeats)
+    chars = sum(map(len, texts))
+    print(f"{os.path.basename(fixture)}: {len(texts)} chunks, {chars} chars, median of {repeats} runs")
+    print(f"  legacy (per-rule re.sub): {legacy_time * 1000:8.2f} ms")
+    print(f"  precompiled + fused:      {fused_time * 1000:8.2f} ms")
+    print(f"  speedup: {legacy_time / fused_time:.2f}x, identical output: {legacy == fused}")
@@ -0,0 +1,58 @@
+"""Serial vs process-pool extraction on a large synthetic PDF.
+
+Builds a document by repeating public/documents/test_1.pdf until it has at
+least the requested number of pages, then times extract_document with the
+pool sized 1, 2, 4, ... up to the CPU count.
+
+Usage: python benchmarks/bench_parallel_extraction.py [min_pages] [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import fitz
+from pdf_processor import PDFProcessor
+from page_extraction import get_pool
+
+SOURCE_PDF = os.path.join(BACKEND_DIR, '..', 'public', 'documents', 'test_1.pdf')
+
+def build_large_pdf(min_pages: int) -> str:
+    path = os.path.join(tempfile.gettempdir(), f'slidesynth_bench_{min_pages}p.pdf')
+    with fitz.open(SOURCE_PDF) as src, fitz.open() as big:
+        while big.page_count < min_pages:
+            big.insert_pdf(src)
+        big.save(path)
+    return path
+
+def median_time(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2], result
+
+if __name__ == '__main__':
+    min_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    path = build_large_pdf(min_pages)
+    processor = PDFProcessor()
+
+    serial_time, serial = median_time(lambda: processor.extract_document(path, parallel=False), repeats)
+    print(f"{serial[1]} pages, {len(serial[0])} chars, {os.cpu_count()} CPUs")
+    print(f"  serial:            {serial_time * 1000:8.1f} ms")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        processor.extraction_workers = workers
+        # Start the pool outside the timed region; it is reused for the life of the process
+        get_pool(workers).submit(int).result()
+        parallel_time, parallel = median_time(lambda: processor.extract_document(path, parallel=True), repeats)
+        print(f"  {workers:2d} worker(s):      {parallel_time * 1000:8.1f} ms  "
+              f"({serial_time / parallel_time:.2f}x, identical: {parallel == serial})")
+        workers *= 2
+    os.remove(path)
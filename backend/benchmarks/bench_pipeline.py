@@ -0,0 +1,199 @@
+"""Offline per-stage benchmark of the whole pipeline with a fake LLM.
+
+Runs extraction, chunking, structuring, prompt building, summarizing
+(through Summarizer with the mock backend standing in for Gemini),
+response parsing, extractive (fast mode) summarizing and PPTX rendering
+over the public/documents PDFs and the backend/tests chunk fixtures.
+Each stage is repeated and reported as p50/p95 latency per run and
+items/sec at the median. Nothing touches the network or the caches, so
+numbers are comparable between runs on the same host.
+
+--json writes the results; --baseline compares p50s against an earlier
+--json file and exits 1 when a stage got slower than --tolerance allows.
+
+Usage: python benchmarks/bench_pipeline.py [--repeats N] [--llm-latency-ms MS]
+           [--stages extract,chunk,...] [--json out.json] [--baseline base.json]
+           [--tolerance 0.25] [pdf-or-fixture ...]
+"""
+import argparse
+import ast
+import glob
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# The harness never reaches Gemini, the LLM cache or the document cache
+os.environ['LLM_CACHE_ENABLED'] = '0'
+
+from pdf_processor import PDFProcessor
+from ai_summarizer import Summarizer
+from summarizer_backends import MockBackend
+from pptx_generator import PPTXGenerator
+
+DEFAULT_INPUTS = (sorted(glob.glob(os.path.join(BACKEND_DIR, '..', 'public', 'documents', '*.pdf')))
+                  + sorted(glob.glob(os.path.join(BACKEND_DIR, 'tests', '*.txt'))))
+STAGES = ('extract', 'chunk', 'structure', 'prompt', 'summarize', 'parse', 'extractive', 'render')
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def load_inputs(paths):
+    """(name, pdf path or None, chunk dicts or None) per input"""
+    inputs = []
+    for path in paths:
+        name = os.path.basename(path)
+        if path.endswith('.pdf'):
+            inputs.append((name, path, None))
+        else:
+            with open(path, encoding='utf-8') as f:
+                inputs.append((name, None, ast.literal_eval(f.read())))
+    return inputs
+
+def measure(run, repeats):
+    """Run run() repeats times; it returns the number of items it processed"""
+    timings, items = [], 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        items = run()
+        timings.append(time.perf_counter() - start)
+    p50 = percentile(timings, 0.5)
+    return {
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+        'items': items,
+        'items_per_sec': round(items / p50, 1) if p50 > 0 else None,
+        'runs': repeats
+    }
+
+def run_suite(inputs, repeats, llm_latency_ms, stages):
+    processor = PDFProcessor()
+    processor.extraction_workers = 1
+    summarizer = Summarizer(MockBackend(llm_latency_ms))
+    generator = PPTXGenerator()
+
+    # Stage inputs are prepared once, untimed, so each stage is measured on its own
+    documents = []
+    for name, path, fixture_chunks in inputs:
+        if path is not None:
+            text, _ = processor.extract_document(path, parallel=False)
+            pages = [text]
+        else:
+            pages = [chunk['text'] for chunk in fixture_chunks]
+        documents.append((name, path, pages))
+    chunk_lists = [list(processor.iter_chunks(pages)) for _, _, pages in documents]
+    structured = [chunk for chunks in chunk_lists for chunk in processor.clean_and_structure_chunks(chunks)]
+    prompts = [summarizer.create_prompt_for_chunk(chunk) for chunk in structured]
+    replies = [MockBackend.reply(prompt) for prompt in prompts]
+    slides = [summarizer.parse_ai_response(reply) for reply in replies]
+    pdfs = [path for _, path, _ in documents if path is not None]
+
+    def extract():
+        return sum(processor.extract_document(path, parallel=False)[1] for path in pdfs)
+
+    def chunk():
+        return sum(len(list(processor.iter_chunks(pages))) for _, _, pages in documents)
+
+    def structure():
+        return sum(len(processor.clean_and_structure_chunks(chunks)) for chunks in chunk_lists)
+
+    def prompt():
+        return len([summarizer.create_prompt_for_chunk(chunk) for chunk in structured])
+
+    def summarize():
+        return len(list(summarizer.iter_slides(structured)))
+
+    def parse():
+        return sum(summarizer.validate_slide_quality(summarizer.parse_ai_response(reply)) for reply in replies)
+
+    def extractive():
+        summarizer.extractive.fit(chunk['text'] for chunk in structured)
+        return len([summarizer.extractive.summarize(chunk) for chunk in structured])
+
+    def render():
+        generator.render(slides)
+        return len(slides)
+
+    runners = {'extract': extract, 'chunk': chunk, 'structure': structure, 'prompt': prompt,
+               'summarize': summarize, 'parse': parse, 'extractive': extractive, 'render': render}
+    results = {}
+    for stage in stages:
+        if stage == 'extract' and not pdfs:
+            continue
+        results[stage] = measure(runners[stage], repeats)
+    return results
+
+def compare(results, baseline, tolerance):
+    """Stages whose p50 exceeds the baseline's by more than tolerance"""
+    regressions = []
+    for stage, current in results.items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous or not previous['p50_ms']:
+            continue
+        change = current['p50_ms'] / previous['p50_ms'] - 1
+        current['baseline_p50_ms'] = previous['p50_ms']
+        current['change'] = round(change, 3)
+        if change > tolerance:
+            regressions.append(stage)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='*', default=DEFAULT_INPUTS)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--llm-latency-ms', type=float, default=0.0)
+    parser.add_argument('--stages', default=','.join(STAGES))
+    parser.add_argument('--json', dest='json_path')
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    stages = [stage for stage in args.stages.split(',') if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages {sorted(unknown)}, expected some of {STAGES}")
+    inputs = load_inputs(args.inputs)
+    results = run_suite(inputs, args.repeats, args.llm_latency_ms, stages)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('llm_latency_ms') != args.llm_latency_ms:
+            print(f"Warning: baseline used a fake LLM latency of {baseline.get('llm_latency_ms')} ms; "
+                  f"summarize timings are not comparable")
+        regressions = compare(results, baseline, args.tolerance)
+
+    print(f"{len(inputs)} inputs, {args.repeats} runs per stage, fake LLM latency {args.llm_latency_ms:g} ms")
+    for stage, result in results.items():
+        line = (f"  {stage:<10} p50 {result['p50_ms']:10.2f} ms  p95 {result['p95_ms']:10.2f} ms  "
+                f"{result['items']:6d} items  {result['items_per_sec'] or 0:12,.1f} items/sec")
+        if 'change' in result:
+            line += f"  {result['change']:+.1%} vs baseline"
+        print(line)
+    if regressions:
+        print(f"Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+
+    if args.json_path:
+        report = {
+            'inputs': [name for name, _, _ in inputs],
+            'repeats': args.repeats,
+            'llm_latency_ms': args.llm_latency_ms,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'stages': results
+        }
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Sentence segmentation throughput in sentences/sec.
+
+Splits every chunk text of the fixtures with the previous per-paragraph
+nltk.sent_tokenize-or-regex code and with SentenceSegmenter in each mode.
+'punkt' is only measured when the Punkt data is installed (see
+lazy_imports.NLTK_DATA_DIR); without it the old code pays for a failed
+NLTK lookup on every paragraph before falling back to the regex.
+
+Usage: python benchmarks/bench_segmentation.py [fixture ...]
+"""
+import ast
+import os
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import nltk
+from segmenter import SentenceSegmenter, get_punkt_tokenizer
+
+DEFAULT_FIXTURES = [os.path.join(BACKEND_DIR, 'tests', name) for name in ('test1.txt', 'test3.txt')]
+
+def legacy_split(text):
+    try:
+        sentences = nltk.sent_tokenize(text)
+        return [s.strip() for s in sentences if s.strip()]
+    except:
+        sentences = re.split(r'[.!?]+', text)
+        return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
+
+def throughput(split_many, texts, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = split_many(texts)
+        timings.append(time.perf_counter() - start)
+    sentences = sum(map(len, result))
+    return sentences, sentences / sorted(timings)[len(timings) // 2]
+
+if __name__ == '__main__':
+    fixtures = sys.argv[1:] or DEFAULT_FIXTURES
+    runners = {'legacy per-call': lambda texts: [legacy_split(text) for text in texts]}
+    modes = ['regex'] + (['punkt'] if get_punkt_tokenizer() is not None else [])
+    for mode in modes:
+        runners[f"segmenter {mode}"] = SentenceSegmenter(mode).split_many
+
+    for fixture in fixtures:
+        with open(fixture, encoding='utf-8') as f:
+            texts = [chunk['text'] for chunk in ast.literal_eval(f.read())]
+        print(f"{os.path.basename(fixture)}: {len(texts)} paragraphs")
+        for name, split_many in runners.items():
+            sentences, rate = throughput(split_many, texts)
+            print(f"    {name:<18} {sentences:7d} sentences {rate:12,.0f} sentences/sec")
+    if 'punkt' not in modes:
+        print("Punkt data not installed; punkt mode skipped")
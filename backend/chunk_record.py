@@ -0,0 +1,99 @@
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional
+
+SLIDE_CONTEXT_HINTS = {
+    'title': 'Create an engaging title slide that introduces the main topic with clear objectives',
+    'introduction': 'Create an introduction slide providing essential background and context',
+    'background': 'Create a background slide explaining historical context and foundational information',
+    'historical_development': 'Create a slide showing the progression and development of historical events',
+    'causes': 'Create a slide explaining the causes, factors, and reasons that led to events',
+    'effects': 'Create a slide detailing the consequences, impacts, and outcomes',
+    'analysis': 'Create an analytical slide that examines and evaluates key aspects',
+    'personal_story': 'Create a slide featuring personal accounts and human perspectives',
+    'methodology': 'Create a methodology slide explaining approach and methods used',
+    'results': 'Create a results slide with key findings and data points',
+    'data': 'Create a data presentation slide with clear statistics and evidence',
+    'conclusion': 'Create a conclusion slide summarizing main points and takeaways',
+    'content': 'Create a content slide with main ideas and supporting details'
+}
+
+@lru_cache(maxsize=None)
+def context_hint(slide_type: str, topic: str) -> str:
+    """AI context hint for a (slide_type, topic) pair, built once and shared by every chunk"""
+    base_context = SLIDE_CONTEXT_HINTS.get(slide_type, 'Create a slide with main ideas and supporting points')
+
+    # Add topic-specific guidance
+    if 'historical' in topic.lower() or 'war' in topic.lower():
+        topic_guidance = "Focus on historical events, key figures, dates, and cause-effect relationships"
+    elif 'political' in topic.lower():
+        topic_guidance = "Focus on political systems, government structures, and power dynamics"
+    elif 'economic' in topic.lower():
+        topic_guidance = "Focus on economic factors, financial impacts, and monetary consequences"
+    else:
+        topic_guidance = f"Focus on {topic} with specific details and examples"
+
+    return f"{base_context}. {topic_guidance}."
+
+class ChunkRecord:
+    """One structured chunk, read like the dict it replaces.
+
+    Labels are interned so every chunk shares one string per label, and
+    length/ai_context are derived on access instead of stored per chunk.
+    """
+
+    __slots__ = ('text', 'estimated_topic', 'slide_type', 'complexity')
+
+    # Keys of the dict view, in the order the JSON API has always used
+    FIELDS = ('text', 'estimated_topic', 'slide_type', 'length', 'complexity', 'ai_context')
+
+    def __init__(self, text: str, estimated_topic: str, slide_type: str, complexity: str):
+        self.text = text
+        self.estimated_topic = sys.intern(estimated_topic)
+        self.slide_type = sys.intern(slide_type)
+        self.complexity = sys.intern(complexity)
+
+    @property
+    def length(self) -> int:
+        return len(self.text)
+
+    @property
+    def ai_context(self) -> str:
+        return context_hint(self.slide_type, self.estimated_topic)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ChunkRecord':
+        return cls(data['text'], data['estimated_topic'], data['slide_type'], data['complexity'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def keys(self):
+        return self.FIELDS
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ChunkRecord):
+            return (self.text, self.estimated_topic, self.slide_type, self.complexity) == \
+                (other.text, other.estimated_topic, other.slide_type, other.complexity)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ChunkRecord({self.slide_type!r}, {self.estimated_topic!r}, {self.length} chars)"
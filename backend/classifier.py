@@ -0,0 +1,180 @@
+import json
+import os
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Rules are checked in order and the first label with a keyword present wins.
+# Keywords match as substrings of the lowercased chunk text.
+DEFAULT_RULES = {
+    'topic': {
+        'rules': [
+            ['historical_events', ['war', 'treaty', 'battle', 'military', 'dictator', 'hitler', 'stalin', 'fascism', 'nazism']],
+            ['political_systems', ['government', 'totalitarian', 'democracy', 'political', 'power', 'control']],
+            ['geography_politics', ['europe', 'asia', 'territory', 'country', 'nation', 'japan', 'germany']],
+            ['cause_and_effect', ['cause', 'effect', 'result', 'consequence', 'impact', 'led to', 'resulted in']],
+            ['economic_factors', ['economic', 'reparations', 'payment', 'treaty of versailles', 'depression']],
+            ['historical_figures', ['benito', 'mussolini', 'churchill', 'chamberlain', 'hideki tojo']],
+            ['methodology', ['method', 'approach', 'procedure', 'design']],
+            ['results', ['result', 'finding', 'data', 'table', 'figure', 'statistics']],
+            ['conclusion', ['conclusion', 'summary', 'implication', 'future', 'takeaway']],
+            ['introduction', ['introduction', 'background', 'overview', 'problem', 'context']]
+        ],
+        'default': 'general_content'
+    },
+    'slide_type': {
+        # Content indicators override position
+        'content_rules': [
+            ['title', ['the big idea', 'key terms', 'main concept', 'overview']],
+            ['analysis', ['reading check', 'summarize', 'analyze causes', 'what factors']],
+            ['background', ['background', 'context', 'roots in', 'centuries-old']],
+            ['historical_development', ['militarists gain control', 'rise of', 'political control']],
+            ['causes', ['treaty of versailles', 'failures of', 'dissatisfied']],
+            ['personal_story', ['martha gellhorn', 'one american', 'personal account']]
+        ],
+        # Applied to chunks in the middle half of the document
+        'middle_rules': [
+            ['data', ['table', 'figure', 'data', 'result', 'statistics']],
+            ['methodology', ['method', 'procedure', 'approach', 'how', 'process']],
+            ['causes', ['cause', 'reason', 'factor', 'led to', 'resulted in']],
+            ['effects', ['effect', 'consequence', 'impact', 'outcome']]
+        ],
+        'middle_default': 'content'
+    }
+}
+
+RuleTable = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+def _compile_rules(rules: List[List[Any]]) -> RuleTable:
+    return tuple((label, tuple(keyword.lower() for keyword in keywords)) for label, keywords in rules)
+
+class KeywordMatcher:
+    """Aho-Corasick automaton: every keyword occurring in a text, in one pass.
+
+    Keywords keep substring semantics ('how' is found in 'show'), so
+    the labels agree with checking each keyword with `in`, but the text is
+    scanned once however many keywords the rules hold.
+    """
+
+    def __init__(self, keywords):
+        keywords = sorted(set(keywords))
+        # Trie, then failure links breadth-first
+        goto, outputs = [{}], [set()]
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                if ch not in goto[state]:
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            outputs[state].add(keyword)
+        fail = [0] * len(goto)
+        order = []
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(ch, 0)
+                outputs[child] |= outputs[fail[child]]
+        # Flat transition table over character classes (0: not in any keyword),
+        # states premultiplied by the class count so a step is one index
+        alphabet = sorted({ch for keyword in keywords for ch in keyword})
+        self._classes = {ch: i + 1 for i, ch in enumerate(alphabet)}
+        width = len(alphabet) + 1
+        table = [0] * (len(goto) * width)
+        for ch, child in goto[0].items():
+            table[self._classes[ch]] = child * width
+        for state in order:
+            row = state * width
+            table[row:row + width] = table[fail[state] * width:fail[state] * width + width]
+            for ch, child in goto[state].items():
+                table[row + self._classes[ch]] = child * width
+        self._table = table
+        self._outputs = {state * width: frozenset(found) for state, found in enumerate(outputs) if found}
+        # Texts of Latin-1 characters are mapped to classes by bytes.translate;
+        # '?' stands in for anything else, so it must not be a keyword character
+        self._byte_classes = None
+        if all(ord(ch) < 256 for ch in alphabet) and '?' not in self._classes:
+            self._byte_classes = bytes(self._classes.get(chr(byte), 0) for byte in range(256))
+
+    def find(self, text_lower: str) -> Set[str]:
+        if self._byte_classes is not None:
+            codes = text_lower.encode('latin-1', 'replace').translate(self._byte_classes)
+        else:
+            get = self._classes.get
+            codes = [get(ch, 0) for ch in text_lower]
+        table, outputs = self._table, self._outputs
+        # An empty keyword is in every text, like '' in text
+        found = set(outputs.get(0, ()))
+        state = 0
+        for code in codes:
+            state = table[state + code]
+            if state in outputs:
+                found |= outputs[state]
+        return found
+
+def _first_found(table: RuleTable, found: Set[str]) -> Optional[str]:
+    for label, keywords in table:
+        if not found.isdisjoint(keywords):
+            return label
+    return None
+
+class RuleClassifier:
+    """Table-driven topic and slide-type classifier for chunk text"""
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None):
+        rules = rules or DEFAULT_RULES
+        self.rules = rules
+        self.topic_rules = _compile_rules(rules['topic']['rules'])
+        self.default_topic = rules['topic']['default']
+        self.content_rules = _compile_rules(rules['slide_type']['content_rules'])
+        self.middle_rules = _compile_rules(rules['slide_type']['middle_rules'])
+        self.middle_default = rules['slide_type']['middle_default']
+        self.matcher = KeywordMatcher(keyword for table in (self.topic_rules, self.content_rules, self.middle_rules)
+                                      for _, keywords in table for keyword in keywords)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'RuleClassifier':
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def topic(self, text_lower: str) -> str:
+        return self._topic(self.matcher.find(text_lower))
+
+    def slide_type(self, text_lower: str, position: int, total_chunks: int) -> str:
+        return self._slide_type(self.matcher.find(text_lower), position, total_chunks)
+
+    def classify(self, text: str, position: int, total_chunks: int) -> Tuple[str, str]:
+        """Return (topic, slide_type), scanning the lowercased text only once"""
+        found = self.matcher.find(text.lower())
+        return self._topic(found), self._slide_type(found, position, total_chunks)
+
+    def _topic(self, found: Set[str]) -> str:
+        return _first_found(self.topic_rules, found) or self.default_topic
+
+    def _slide_type(self, found: Set[str], position: int, total_chunks: int) -> str:
+        label = _first_found(self.content_rules, found)
+        if label:
+            return label
+        if position == 0:
+            return 'title'
+        elif position < total_chunks * 0.25:
+            return 'introduction'
+        elif position > total_chunks * 0.75:
+            return 'conclusion'
+        return _first_found(self.middle_rules, found) or self.middle_default
+
+_default_classifier = None
+
+def get_default_classifier() -> RuleClassifier:
+    """Built-in rules, or the JSON file named by SLIDESYNTH_CLASSIFIER_RULES"""
+    global _default_classifier
+    if _default_classifier is None:
+        path = os.getenv('SLIDESYNTH_CLASSIFIER_RULES')
+        _default_classifier = RuleClassifier.from_file(path) if path else RuleClassifier()
+    return _default_classifier
@@ -0,0 +1,99 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from lazy_imports import lazy_module
+
+np = lazy_module('numpy')
+
+_TOKEN_RE = re.compile(r'\w+')
+# Smallest prime above 2**32 (2**32 + 15), so crc32 shingle hashes stay below it
+_HASH_PRIME = 4294967311
+
+def candidate_probability(similarity: float, bands: int, rows: int) -> float:
+    """Chance that two texts with this Jaccard similarity share at least one LSH bucket"""
+    return 1 - (1 - similarity ** rows) ** bands
+
+def _choose_bands(num_perm: int, threshold: float, min_recall: float) -> Tuple[int, int]:
+    """Pick the most selective (bands, rows) that still finds min_recall of pairs at the threshold.
+
+    Pairs the index never proposes can't be recovered by the exact Jaccard
+    check, so recall at the threshold is the constraint; among the layouts
+    that meet it, more rows per band means fewer dissimilar candidates.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if candidate_probability(threshold, bands, rows) >= min_recall:
+            best = (bands, rows)
+    return best
+
+class NearDuplicateFilter:
+    """Streaming near-duplicate detector using word-shingle MinHash with an LSH index.
+
+    Each text is compared only against earlier texts sharing an LSH bucket, so
+    checking n chunks stays close to linear instead of n^2 pairwise Jaccards.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 64, shingle_size: int = 3, seed: int = 1,
+                 min_recall: float = 0.99):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _choose_bands(num_perm, threshold, min_recall)
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 2 ** 31, size=num_perm).astype(np.uint64)
+        self._prime = np.uint64(_HASH_PRIME)
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(self.bands)]
+        self._shingles: List[Set[int]] = []
+        self.checked = 0
+        self.duplicates = 0
+
+    def shingles(self, text: str) -> Set[int]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        k = self.shingle_size
+        if len(tokens) < k:
+            grams = [' '.join(tokens)]
+        else:
+            grams = [' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)]
+        return {zlib.crc32(gram.encode('utf-8')) for gram in grams}
+
+    def signature(self, shingles: Set[int]) -> 'np.ndarray':
+        hashes = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        return ((hashes[:, None] * self._a + self._b) % self._prime).min(axis=0)
+
+    def is_duplicate(self, text: str) -> bool:
+        """Check text against everything added so far; remember it if it is new"""
+        self.checked += 1
+        shingles = self.shingles(text)
+        band_keys = self._band_keys(self.signature(shingles))
+
+        seen = set()
+        for band, key in enumerate(band_keys):
+            for doc_id in self._buckets[band].get(key, ()):
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                if self._jaccard(shingles, self._shingles[doc_id]) >= self.threshold:
+                    self.duplicates += 1
+                    return True
+
+        doc_id = len(self._shingles)
+        self._shingles.append(shingles)
+        for band, key in enumerate(band_keys):
+            self._buckets[band][key].append(doc_id)
+        return False
+
+    def _band_keys(self, signature: 'np.ndarray') -> List[bytes]:
+        rows = self.rows
+        return [signature[band * rows:(band + 1) * rows].tobytes() for band in range(self.bands)]
+
+    @staticmethod
+    def _jaccard(a: Set[int], b: Set[int]) -> float:
+        if not a and not b:
+            return 1.0
+        return len(a & b) / len(a | b)
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from llm_cache import DEFAULT_CACHE_DIR
+from metrics import DOCUMENT_CACHE
+
+class DocumentCache:
+    """Per-document pipeline cache with one tier per stage.
+
+    Each tier key is derived from the previous tier's key plus that stage's
+    config fingerprint, so changing e.g. the prompt version only misses the
+    'slides' and 'pptx' tiers while extracted text and chunks are reused.
+
+    Reads refresh an entry's mtime, so the TTL counts from last use and the
+    size cap evicts least recently used entries first, like the LLM cache.
+
+    The 'lineage' tier is keyed by document lineage (filename or client id)
+    instead of content, and maps the chunk hashes of the latest upload to
+    their slides so a revised file only re-summarizes the chunks that changed.
+    """
+
+    TIERS = ('text', 'chunks', 'slides', 'pptx', 'lineage')
+
+    def __init__(self, root: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 max_bytes: Optional[int] = None, prune_interval: Optional[int] = None):
+        self.root = root or os.getenv('DOCUMENT_CACHE_DIR', os.path.join(DEFAULT_CACHE_DIR, 'documents'))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv('DOCUMENT_CACHE_TTL', str(7 * 24 * 3600)))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv('DOCUMENT_CACHE_MAX_BYTES', str(1024 * 1024 * 1024)))
+        # Writes trigger a prune at most this often, so a long-running server stays bounded
+        self.prune_interval = prune_interval if prune_interval is not None else int(os.getenv('DOCUMENT_CACHE_PRUNE_INTERVAL', '300'))
+        self.hits = {tier: 0 for tier in self.TIERS}
+        self.misses = {tier: 0 for tier in self.TIERS}
+        self.evictions = 0
+        self._last_prune = 0.0
+        self._prune_lock = threading.Lock()
+        for tier in self.TIERS:
+            os.makedirs(os.path.join(self.root, tier), exist_ok=True)
+
+    @staticmethod
+    def hash_file(path: str, block_size: int = 1024 * 1024) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def tier_key(parent_key: str, fingerprint: Dict[str, Any]) -> str:
+        payload = json.dumps({'parent': parent_key, 'config': fingerprint}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_json(self, tier: str, key: str) -> Optional[Any]:
+        data = self._read(tier, key, '.json')
+        return json.loads(data) if data is not None else None
+
+    def put_json(self, tier: str, key: str, value: Any):
+        self._write(tier, key, '.json', json.dumps(value).encode('utf-8'))
+
+    def stats(self) -> Dict[str, Any]:
+        return {'hits': dict(self.hits), 'misses': dict(self.misses), 'evictions': self.evictions}
+
+    def prune(self):
+        """Remove entries unused for longer than the TTL, then the least recently used until under max_bytes"""
+        with self._prune_lock:
+            now = time.time()
+            self._last_prune = now
+            cutoff = now - self.ttl_seconds if self.ttl_seconds else None
+            entries = []
+            for tier in self.TIERS:
+                tier_dir = os.path.join(self.root, tier)
+                for name in os.listdir(tier_dir):
+                    path = os.path.join(tier_dir, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    # Leave other writers' in-flight temp files alone unless they are stale
+                    if name.endswith('.tmp') and stat.st_mtime > now - 3600:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+            entries.sort()
+            total_bytes = sum(size for _, size, _ in entries)
+            for mtime, size, path in entries:
+                if (cutoff is None or mtime >= cutoff) and total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    self.evictions += 1
+                except OSError:
+                    pass
+                total_bytes -= size
+
+    def _path(self, tier: str, key: str, suffix: str) -> str:
+        return os.path.join(self.root, tier, key + suffix)
+
+    def _read(self, tier: str, key: str, suffix: str) -> Optional[bytes]:
+        path = self._path(tier, key, suffix)
+        try:
+            if self.ttl_seconds and time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                raise FileNotFoundError(path)
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses[tier] += 1
+            DOCUMENT_CACHE.inc(tier=tier, result='miss')
+            return None
+        self.hits[tier] += 1
+        DOCUMENT_CACHE.inc(tier=tier, result='hit')
+        return data
+
+    def _write(self, tier: str, key: str, suffix: str, data: bytes):
+        # Write to a temp file and rename so concurrent readers never see a partial entry
+        tier_dir = os.path.join(self.root, tier)
+        fd, tmp_path = tempfile.mkstemp(dir=tier_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(tier, key, suffix))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if time.time() - self._last_prune >= self.prune_interval:
+            self.prune()
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_document_cache() -> Optional[DocumentCache]:
+    """Process-wide document cache, or None when DOCUMENT_CACHE_ENABLED is not '1'"""
+    global _default_cache
+    if os.getenv('DOCUMENT_CACHE_ENABLED', '1') != '1':
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = DocumentCache()
+            _default_cache.prune()
+        return _default_cache
@@ -0,0 +1,173 @@
+"""Extractive slide summarization: TF-IDF sentence vectors ranked with TextRank.
+
+Picks a keyphrase title and the 3-5 most central sentences of a chunk
+without any model or network call, in well under a millisecond per chunk.
+Used for fast mode, as a backend when Gemini isn't configured, and for
+fallback slides when an LLM request fails.
+"""
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lazy_imports import lazy_module
+from segmenter import SentenceSegmenter
+
+np = lazy_module('numpy')
+
+_TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z0-9'-]+")
+# Words that never start, end or make up a title phrase on their own
+_STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either et al etc few for
+from further had has have having he her here hers herself him himself his how however i if in into
+is it its itself just may me might more most much must my myself no nor not now of off on once only
+or other our ours ourselves out over own per same she should so some such than that the their
+theirs them themselves then there therefore these they this those through thus to too under until
+up upon us very via was we were what when where whether which while who whom why will with within
+without would yet you your yours yourself yourselves one two three also using used use based
+""".split())
+
+TITLE_PREFIXES = {
+    'title': '{}: Overview',
+    'introduction': 'Understanding {}',
+    'conclusion': 'Key Takeaways: {}',
+    'methodology': '{}: Approach and Methods',
+    'results': '{}: Findings'
+}
+
+class ExtractiveSummarizer:
+    """Title and bullets for a chunk from its own sentences.
+
+    fit() learns document-level IDF from all chunks of a deck, so terms that
+    appear everywhere (the paper's subject) don't dominate every slide;
+    without it each chunk is weighted on its own.
+    """
+
+    def __init__(self, segmenter: Optional[SentenceSegmenter] = None, min_bullets: int = 3,
+                 max_bullets: int = 5, max_bullet_words: int = 30, damping: float = 0.85,
+                 iterations: int = 50, tolerance: float = 1e-6):
+        self.segmenter = segmenter or SentenceSegmenter()
+        self.min_bullets = min_bullets
+        self.max_bullets = max_bullets
+        self.max_bullet_words = max_bullet_words
+        self.damping = damping
+        self.iterations = iterations
+        self.tolerance = tolerance
+        self.idf: Dict[str, float] = {}
+        self.default_idf = 1.0
+
+    def fingerprint(self) -> Dict[str, object]:
+        return {'engine': 'textrank', 'version': 1, 'min_bullets': self.min_bullets,
+                'max_bullets': self.max_bullets, 'max_bullet_words': self.max_bullet_words}
+
+    def fit(self, texts: Iterable[str]) -> 'ExtractiveSummarizer':
+        document_frequency: Dict[str, int] = {}
+        count = 0
+        for text in texts:
+            count += 1
+            for term in set(self._terms(text)):
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        # Smoothed IDF; unseen terms count as appearing in one chunk
+        self.idf = {term: math.log((1 + count) / (1 + df)) + 1 for term, df in document_frequency.items()}
+        self.default_idf = math.log((1 + count) / 2) + 1
+        return self
+
+    def summarize(self, chunk: Dict[str, object]) -> Dict[str, object]:
+        text = str(chunk.get('text', ''))
+        sentences = [s for s in self.segmenter.split(text) if len(s.split()) >= 4]
+        if not sentences and text.strip():
+            sentences = [text.strip()]
+        ranked = self.rank_sentences(sentences)
+        count = min(self.max_bullets, max(self.min_bullets, len(sentences) // 3), len(sentences))
+        # Keep the chosen sentences in reading order
+        chosen = sorted(index for index, _ in ranked[:count])
+        bullets = [self._trim(sentences[index]) for index in chosen]
+        return {
+            'title': self.title(text, str(chunk.get('slide_type', 'content')), str(chunk.get('estimated_topic', 'general'))),
+            'bullets': bullets or ['Key information from source material']
+        }
+
+    def rank_sentences(self, sentences: List[str]) -> List[Tuple[int, float]]:
+        """(sentence index, TextRank score), best first"""
+        if len(sentences) <= 1:
+            return [(index, 1.0) for index in range(len(sentences))]
+        vectors = self._tfidf_matrix([self._terms(sentence) for sentence in sentences])
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0.0)
+        row_sums = similarity.sum(axis=1, keepdims=True)
+        # Sentences sharing no terms with the others link to every sentence evenly
+        transition = np.where(row_sums > 0, similarity / np.where(row_sums > 0, row_sums, 1), 1.0 / len(sentences))
+        scores = np.full(len(sentences), 1.0 / len(sentences))
+        teleport = (1 - self.damping) / len(sentences)
+        for _ in range(self.iterations):
+            updated = teleport + self.damping * (transition.T @ scores)
+            converged = np.abs(updated - scores).sum() < self.tolerance
+            scores = updated
+            if converged:
+                break
+        return sorted(enumerate(scores.tolist()), key=lambda item: (-item[1], item[0]))
+
+    def title(self, text: str, slide_type: str, topic: str) -> str:
+        phrase = self.key_phrase(text)
+        if not phrase:
+            return f"{topic.replace('_', ' ').title()} Overview"
+        return TITLE_PREFIXES.get(slide_type, '{}').format(phrase)
+
+    def key_phrase(self, text: str, max_words: int = 5) -> str:
+        """Highest-weighted run of non-stopwords (RAKE-style), title-cased"""
+        weights = self._term_weights(text)
+        best, best_score = None, 0.0
+        for run in self._candidate_phrases(text):
+            for start in range(len(run)):
+                words = run[start:start + max_words]
+                # Prefer 2-4 word phrases over single keywords and long runs
+                score = sum(weights.get(word.lower(), 0.0) for word in words) / (1 + 0.6 * abs(len(words) - 3))
+                if score > best_score:
+                    best, best_score = words, score
+        if not best:
+            return ''
+        return ' '.join(word if word.isupper() else word.capitalize() for word in best)
+
+    def _candidate_phrases(self, text: str) -> List[List[str]]:
+        runs, current = [], []
+        # Punctuation between words ends a phrase as well as stopwords do
+        for token in re.findall(r"[A-Za-z][A-Za-z0-9'-]+|[^\sA-Za-z]", text):
+            if token[0].isalpha() and token.lower() not in _STOPWORDS and len(token) > 2:
+                current.append(token)
+            elif current:
+                runs.append(current)
+                current = []
+        if current:
+            runs.append(current)
+        return runs
+
+    def _term_weights(self, text: str) -> Dict[str, float]:
+        weights: Dict[str, float] = {}
+        for term in self._terms(text):
+            weights[term] = weights.get(term, 0.0) + self.idf.get(term, self.default_idf)
+        return weights
+
+    def _terms(self, text: str) -> List[str]:
+        return [token for token in map(str.lower, _TOKEN_RE.findall(text)) if token not in _STOPWORDS and len(token) > 2]
+
+    def _tfidf_matrix(self, documents: List[List[str]]) -> 'np.ndarray':
+        vocabulary: Dict[str, int] = {}
+        for terms in documents:
+            for term in terms:
+                vocabulary.setdefault(term, len(vocabulary))
+        matrix = np.zeros((len(documents), max(1, len(vocabulary))))
+        for row, terms in enumerate(documents):
+            for term in terms:
+                matrix[row, vocabulary[term]] += 1.0
+        idf = np.ones(matrix.shape[1])
+        for term, column in vocabulary.items():
+            idf[column] = self.idf.get(term, self.default_idf)
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms > 0, norms, 1)
+
+    def _trim(self, sentence: str) -> str:
+        words = sentence.split()
+        if len(words) <= self.max_bullet_words:
+            return sentence
+        return ' '.join(words[:self.max_bullet_words]).rstrip(',;:') + '...'
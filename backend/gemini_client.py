@@ -0,0 +1,70 @@
+"""Process-wide Gemini client shared by every Summarizer.
+
+A genai.Client owns an httpx connection pool (plus an SSL context built
+from the certifi bundle), so creating one per job threw away keep-alive
+connections and TLS sessions and paid that setup again on the first
+chunk of every deck. httpx clients are thread-safe, so one client per API
+key serves all job and summarizer threads of the process.
+"""
+import os
+import threading
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from lazy_imports import lazy_module
+
+genai = lazy_module('google.genai')
+genai_types = lazy_module('google.genai.types')
+httpx = lazy_module('httpx')
+
+_clients: Dict[str, object] = {}
+_clients_lock = threading.Lock()
+_env_loaded = False
+
+def load_env():
+    """Read backend/.env once per process instead of on every Summarizer()"""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+def pool_settings() -> Dict[str, float]:
+    # Enough connections for every in-flight request of two concurrent jobs by default
+    concurrency = int(os.getenv('GEMINI_MAX_CONCURRENCY', '8'))
+    return {
+        'pool_size': int(os.getenv('GEMINI_POOL_SIZE', str(max(concurrency * 2, 10)))),
+        'timeout': float(os.getenv('GEMINI_TIMEOUT', '60')),
+        'connect_timeout': float(os.getenv('GEMINI_CONNECT_TIMEOUT', '10')),
+        'keepalive_expiry': float(os.getenv('GEMINI_KEEPALIVE_EXPIRY', '60'))
+    }
+
+def create_client(api_key: str, pool_size: int, timeout: float, connect_timeout: float,
+                  keepalive_expiry: float):
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                          keepalive_expiry=keepalive_expiry)
+    http_options = genai_types.HttpOptions(
+        # HttpOptions.timeout is in milliseconds; the httpx timeout adds a separate connect limit
+        timeout=int(timeout * 1000),
+        client_args={'limits': limits, 'timeout': httpx.Timeout(timeout, connect=connect_timeout)}
+    )
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+def get_client(api_key: Optional[str] = None):
+    """Shared client for api_key (default: GEMINI_API_KEY), created on first use"""
+    load_env()
+    api_key = api_key or os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY environment variable is required")
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                client = create_client(api_key, **pool_settings())
+                _clients[api_key] = client
+    return client
+
+def reset_clients():
+    """Drop the shared clients, e.g. after a fork or when the key is rotated"""
+    with _clients_lock:
+        _clients.clear()
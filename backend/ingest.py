@@ -0,0 +1,124 @@
+"""Upload buffering that hashes and size-checks a file while it is received.
+
+Werkzeug hands every uploaded file part to Request._get_file_stream();
+IngestRequest returns an UploadBuffer there, so the bytes are hashed and
+counted as they come off the socket, kept in memory for the usual upload
+and only spilled to a temp file above a threshold. The pipeline then opens
+the PDF straight from that buffer instead of saving and re-reading it.
+"""
+import hashlib
+import io
+import os
+import tempfile
+from typing import Optional
+
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from lazy_imports import lazy_module
+
+fitz = lazy_module('fitz')
+
+class UploadBuffer:
+    """Writable, readable upload container with a running SHA-256.
+
+    Werkzeug closes request files when the request ends; call detach() to
+    keep the buffer for a background job and release() once it is done.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, spill_threshold: Optional[int] = None,
+                 spill_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.spill_threshold = spill_threshold if spill_threshold is not None else int(os.getenv('UPLOAD_SPILL_THRESHOLD', str(16 * 1024 * 1024)))
+        self.spill_dir = spill_dir
+        self.size = 0
+        self.path: Optional[str] = None
+        self._hash = hashlib.sha256()
+        self._file = io.BytesIO()
+        self._detached = False
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def in_memory(self) -> bool:
+        return self.path is None
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise RequestEntityTooLarge()
+        self._hash.update(data)
+        if self.path is None and self.size > self.spill_threshold:
+            self.spill()
+        return self._file.write(data)
+
+    def spill(self) -> str:
+        """Move the contents to a temp file (if still in memory) and return its path"""
+        if self.path is None:
+            fd, path = tempfile.mkstemp(dir=self.spill_dir, suffix='.pdf')
+            spilled = os.fdopen(fd, 'w+b')
+            position = self._file.tell()
+            spilled.write(self._file.getbuffer())
+            spilled.seek(position)
+            spilled.flush()
+            self._file = spilled
+            self.path = path
+        else:
+            self._file.flush()
+        return self.path
+
+    def open_document(self):
+        """Open the buffered PDF with PyMuPDF without copying it"""
+        if self.path is not None:
+            self._file.flush()
+            return fitz.open(self.path)
+        return fitz.open(stream=self._file.getbuffer(), filetype='pdf')
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._file.readline(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def detach(self):
+        self._detached = True
+
+    def close(self):
+        if not self._detached:
+            self.release()
+
+    def release(self):
+        """Drop the buffered data and any spill file"""
+        if self.path is not None:
+            self._file.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.path = None
+        # PyMuPDF may still reference the memory buffer; let it go with the last reference
+        self._file = io.BytesIO()
+        self._detached = False
+
+class IngestRequest(Request):
+    """Flask request class that receives uploaded files into UploadBuffers"""
+
+    spill_dir: Optional[str] = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return UploadBuffer(max_bytes=self.max_content_length, spill_dir=self.spill_dir)
@@ -0,0 +1,272 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from llm_cache import DEFAULT_CACHE_DIR
+from metrics import JOBS
+
+logger = logging.getLogger(__name__)
+
+class QueueFullError(Exception):
+    pass
+
+class JobCancelled(Exception):
+    pass
+
+class JobStore:
+    """SQLite table of job state shared by every server process on the host.
+
+    The process that accepted an upload runs the job and writes its state
+    here, so a status poll that lands on any other worker can still answer.
+    """
+
+    FIELDS = ('id', 'filename', 'status', 'stage', 'done', 'total', 'result', 'error', 'created_at', 'updated_at')
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Opened on first use in each process: a connection inherited through
+        # fork (gunicorn --preload imports the app before forking workers)
+        # must not be used by the child
+        self._pid = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """This process's connection; call without holding self._lock"""
+        if self._pid != os.getpid():
+            # The parent's lock may have been held by another thread at fork
+            self._lock = threading.Lock()
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    done INTEGER NOT NULL,
+                    total INTEGER NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def save(self, record: Dict[str, Any]):
+        row = dict(record, result=json.dumps(record['result']) if record['result'] is not None else None)
+        conn = self._connection()
+        with self._lock:
+            conn.execute(
+                f"INSERT OR REPLACE INTO jobs ({', '.join(self.FIELDS)}) VALUES ({', '.join('?' * len(self.FIELDS))})",
+                tuple(row[field] for field in self.FIELDS)
+            )
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connection()
+        with self._lock:
+            row = conn.execute(
+                f"SELECT {', '.join(self.FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(self.FIELDS, row))
+        if record['result'] is not None:
+            record['result'] = json.loads(record['result'])
+        return record
+
+    def prune(self, cutoff: float):
+        conn = self._connection()
+        with self._lock:
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed', 'cancelled') AND updated_at < ?", (cutoff,)
+            )
+
+def get_job_store() -> Optional[JobStore]:
+    """Shared job store, or None when SLIDESYNTH_JOB_STORE is set to '0' (single process only)"""
+    if os.getenv('SLIDESYNTH_JOB_STORE', '1') != '1':
+        return None
+    return JobStore(os.getenv('SLIDESYNTH_JOB_DB', os.path.join(DEFAULT_CACHE_DIR, 'jobs.sqlite3')))
+
+class Job:
+    def __init__(self, filename: str, store: Optional[JobStore] = None):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.status = 'queued'
+        self.stage = 'queued'
+        self.done = 0
+        self.total = 0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        # Set for streaming jobs: (event, data) tuples for the request that is relaying them, None at the end
+        self.events: Optional[queue.Queue] = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self.store = store
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'Job':
+        """Read-only snapshot of a job that is running (or ran) in another process"""
+        job = cls(record['filename'])
+        for key, value in record.items():
+            setattr(job, key, value)
+        return job
+
+    def to_record(self) -> Dict[str, Any]:
+        with self._lock:
+            return {field: getattr(self, field) for field in JobStore.FIELDS}
+
+    def update(self, **fields):
+        with self._lock:
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self.updated_at = time.time()
+        if self.store is not None:
+            self.store.save(self.to_record())
+
+    def report_progress(self, stage: str, done: int, total: int):
+        self.update(stage=stage, done=done, total=total)
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        if self.events is not None:
+            self.events.put((event, data))
+
+    def cancel(self):
+        """Ask the work function to stop at its next check_cancelled()"""
+        self._cancelled.set()
+
+    def check_cancelled(self):
+        if self._cancelled.is_set():
+            raise JobCancelled(self.id)
+
+    def iter_events(self, keepalive_seconds: float = 15) -> Iterator[Optional[Tuple[str, Dict[str, Any]]]]:
+        """Yield published events until the job ends; None every keepalive_seconds of silence"""
+        while True:
+            try:
+                item = self.events.get(timeout=keepalive_seconds)
+            except queue.Empty:
+                yield None
+                continue
+            if item is None:
+                return
+            yield item
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('succeeded', 'failed', 'cancelled')
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                'job_id': self.id,
+                'filename': self.filename,
+                'status': self.status,
+                'stage': self.stage,
+                'progress': {
+                    'done': self.done,
+                    'total': self.total,
+                    'percent': round(100 * self.done / self.total, 1) if self.total else None
+                },
+                'created_at': self.created_at,
+                'updated_at': self.updated_at
+            }
+            if self.status == 'succeeded':
+                data['result'] = self.result
+            elif self.status == 'failed':
+                data['error'] = self.error
+            return data
+
+class JobManager:
+    """Bounded worker pool for slide generation jobs.
+
+    Jobs run on a thread pool in the process that accepted them, and the
+    max_pending limit applies per process. Their state is also written to
+    the shared JobStore, so under a multi-process server a status poll can
+    be answered by any worker on the same host. Running jobs on separate
+    machines from the web tier would need a real queue and is not supported.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 retention_seconds: Optional[int] = None, store: Optional[JobStore] = None):
+        self.max_workers = max_workers or int(os.getenv('SLIDESYNTH_JOB_WORKERS', '2'))
+        self.max_pending = max_pending or int(os.getenv('SLIDESYNTH_MAX_PENDING_JOBS', '32'))
+        self.retention_seconds = retention_seconds or int(os.getenv('SLIDESYNTH_JOB_RETENTION', '3600'))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='slidesynth-job')
+        self.store = store if store is not None else get_job_store()
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, filename: str, work: Callable[[Job], Dict[str, Any]],
+               cleanup: Optional[Callable[[], None]] = None, stream: bool = False) -> Job:
+        """Queue work(job) on the pool, or raise QueueFullError when max_pending jobs are waiting.
+
+        With stream=True the job gets an event queue that work can publish() to
+        and the caller can relay with iter_events().
+        """
+        job = Job(filename, self.store)
+        if stream:
+            job.events = queue.Queue()
+        with self._lock:
+            self._prune()
+            pending = sum(1 for j in self._jobs.values() if not j.finished)
+            if pending >= self.max_pending:
+                raise QueueFullError(f"Too many pending jobs ({pending})")
+            self._jobs[job.id] = job
+        if self.store is not None:
+            self.store.save(job.to_record())
+        self._executor.submit(self._run, job, work, cleanup)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            record = self.store.load(job_id)
+            if record is not None:
+                job = Job.from_record(record)
+        return job
+
+    def _run(self, job: Job, work: Callable[[Job], Dict[str, Any]], cleanup: Optional[Callable[[], None]]):
+        job.update(status='running', stage='starting')
+        try:
+            job.check_cancelled()
+            result = work(job)
+            job.update(status='succeeded', stage='done', result=result)
+        except JobCancelled:
+            job.update(status='cancelled', stage='cancelled')
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job.id, job.filename)
+            job.update(status='failed', error=f'Processing failed: {str(e)}')
+            job.publish('error', {'error': job.error})
+        finally:
+            JOBS.inc(status=job.status)
+            if job.events is not None:
+                job.events.put(None)
+            if cleanup:
+                try:
+                    cleanup()
+                except OSError as e:
+                    logger.warning("Job cleanup failed for %s: %s", job.id, e)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.updated_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if self.store is not None:
+            self.store.prune(cutoff)
@@ -0,0 +1,92 @@
+"""Deferred imports for the heavy third-party modules.
+
+google-genai, NLTK, PyMuPDF, python-pptx and numpy together take well over
+a second to import, so modules bind them through lazy_module() and the cost
+is paid on first use instead of at worker start. warm_up() loads everything
+up front for processes that would rather pay it before the first request.
+"""
+import importlib
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+# Bundled tokenizer data; NLTK's own NLTK_DATA and default locations are searched too
+NLTK_DATA_DIR = os.getenv('SLIDESYNTH_NLTK_DATA', os.path.join(BACKEND_DIR, 'nltk_data'))
+# sent_tokenize in NLTK 3.9+ reads the pickle-free punkt_tab tables
+PUNKT_RESOURCE = 'tokenizers/punkt_tab/english/'
+
+logger = logging.getLogger(__name__)
+
+_registry: Dict[str, 'LazyModule'] = {}
+_warm_up_hooks: List[Callable[[], object]] = []
+_punkt_available: Optional[bool] = None
+_punkt_lock = threading.Lock()
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+def lazy_module(name: str) -> LazyModule:
+    if name not in _registry:
+        _registry[name] = LazyModule(name)
+    return _registry[name]
+
+def punkt_available() -> bool:
+    """Whether the Punkt sentence tokenizer data is installed locally.
+
+    Checked once per process. Nothing is ever downloaded: offline containers
+    would hang on the attempt, and chunking falls back to a regex splitter.
+    """
+    global _punkt_available
+    if _punkt_available is None:
+        with _punkt_lock:
+            if _punkt_available is None:
+                nltk = lazy_module('nltk')
+                if NLTK_DATA_DIR not in nltk.data.path:
+                    nltk.data.path.insert(0, NLTK_DATA_DIR)
+                try:
+                    nltk.data.find(PUNKT_RESOURCE)
+                    _punkt_available = True
+                except LookupError:
+                    logger.warning("Punkt tokenizer data not found (looked in %s and NLTK defaults); "
+                                   "using regex sentence splitting", NLTK_DATA_DIR)
+                    _punkt_available = False
+    return _punkt_available
+
+def on_warm_up(hook: Callable[[], object]):
+    """Register a loader (e.g. a model that is built on first use) for warm_up() to run"""
+    _warm_up_hooks.append(hook)
+
+def warm_up(modules: Optional[List[str]] = None) -> List[str]:
+    """Import the given (default: all registered) lazy modules, check tokenizer data and run hooks"""
+    names = modules if modules is not None else list(_registry)
+    for name in names:
+        lazy_module(name).load()
+    punkt_available()
+    for hook in _warm_up_hooks:
+        hook()
+    return names
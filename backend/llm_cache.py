@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+class LLMCache:
+    """SQLite-backed cache of LLM responses keyed on the prompt and generation settings.
+
+    Entries are evicted least-recently-used first once the cache grows past
+    max_entries or max_bytes, and are ignored (and purged) after ttl_seconds.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 ttl_seconds: int = 30 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, max_tokens: int, **extra: Any) -> str:
+        payload = json.dumps({
+            'prompt': prompt,
+            'model': model,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+            **extra
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+            return response
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, response, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                (key, response, size, now, now)
+            )
+            self._evict(now)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': total_bytes
+        }
+
+    def _evict(self, now: float):
+        if self.ttl_seconds:
+            cur = self._conn.execute('DELETE FROM responses WHERE created_at < ?', (now - self.ttl_seconds,))
+            self.evictions += max(cur.rowcount, 0)
+
+        entries, total_bytes = self._conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+        ).fetchone()
+        if entries <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        # Walk from least recently used until both limits are satisfied
+        doomed = []
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed_at ASC'):
+            if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            doomed.append((key,))
+            entries -= 1
+            total_bytes -= size
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', doomed)
+        self.evictions += len(doomed)
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache() -> Optional[LLMCache]:
+    """Process-wide cache configured from the environment, or None when disabled"""
+    global _default_cache
+    if os.getenv('LLM_CACHE_ENABLED', '1') != '1':
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache(
+                os.getenv('LLM_CACHE_PATH', os.path.join(DEFAULT_CACHE_DIR, 'llm_responses.sqlite3')),
+                max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', '10000')),
+                max_bytes=int(os.getenv('LLM_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+                ttl_seconds=int(os.getenv('LLM_CACHE_TTL', str(30 * 24 * 3600)))
+            )
+        return _default_cache
@@ -0,0 +1,173 @@
+"""In-process counters, latency histograms and timing spans.
+
+Everything is kept per process and exported in the Prometheus text format
+by /api/metrics; with several server processes, scrape each one (or put
+them behind a multiprocess-aware collector). Spans also go to the
+'slidesynth.span' logger at DEBUG, so the old per-stage prints can be
+brought back with LOG_LEVEL=DEBUG without paying for them by default.
+"""
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+span_logger = logging.getLogger('slidesynth.span')
+
+# Seconds; covers sub-millisecond parsing up to slow LLM calls and large extractions
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 4000, 8000)
+
+LabelValues = Tuple[str, ...]
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(tuple(str(labels[name]) for name in self.labelnames))
+        return sum(entry[0]) if entry else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(counts), total[0]) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            # Re-registering a name (e.g. on module reload) returns the existing metric
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'slidesynth_stage_seconds', 'Time spent per pipeline stage', ['stage'])
+LLM_REQUESTS = REGISTRY.counter(
+    'slidesynth_llm_requests_total', 'LLM prompts by outcome (ok, error, cache_hit)', ['outcome'])
+LLM_RETRIES = REGISTRY.counter(
+    'slidesynth_llm_retries_total', 'LLM request attempts that were retried')
+LLM_TOKENS = REGISTRY.counter(
+    'slidesynth_llm_tokens_total', 'Tokens reported by the LLM API (input, output, cached)', ['kind'])
+LLM_SLIDE_TOKENS = REGISTRY.histogram(
+    'slidesynth_llm_slide_tokens', 'LLM tokens per generated slide (input, output)', ['kind'], TOKEN_BUCKETS)
+PROMPT_TRUNCATIONS = REGISTRY.counter(
+    'slidesynth_prompt_truncations_total', 'Chunks cut to fit the LLM input token budget')
+SLIDES = REGISTRY.counter(
+    'slidesynth_slides_total', 'Slides produced by source (llm, fallback, extractive, cache, lineage)', ['source'])
+DOCUMENT_CACHE = REGISTRY.counter(
+    'slidesynth_document_cache_total', 'Document cache lookups by tier and result', ['tier', 'result'])
+JOBS = REGISTRY.counter(
+    'slidesynth_jobs_total', 'Finished jobs by status', ['status'])
+
+@contextmanager
+def span(stage: str, **attributes) -> Iterator[Dict[str, object]]:
+    """Time a block into slidesynth_stage_seconds{stage=...}.
+
+    Yields a dict the block can add attributes to (e.g. token counts);
+    they are included in the DEBUG log line for the span.
+    """
+    start = time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        if span_logger.isEnabledFor(logging.DEBUG):
+            details = ' '.join(f"{key}={value}" for key, value in attributes.items())
+            span_logger.debug("%s %.1fms %s", stage, elapsed * 1000, details)
+
+def render_metrics(registry: Optional[Registry] = None) -> str:
+    return (registry or REGISTRY).render()
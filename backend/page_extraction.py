@@ -0,0 +1,79 @@
+"""Page-range text extraction that can run in worker processes.
+
+Kept separate from pdf_processor so spawned workers only import fitz,
+not NLTK and the rest of the chunking code.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from lazy_imports import lazy_module
+
+fitz = lazy_module('fitz')
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+def extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    # Each worker opens its own document; fitz handles can't be shared across processes
+    with fitz.open(path) as doc:
+        return [doc[i].get_text().strip() for i in range(start, stop)]
+
+def split_page_range(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def default_worker_count() -> int:
+    return int(os.getenv('PDF_EXTRACTION_WORKERS', str(os.cpu_count() or 1)))
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """Process-wide pool, created on first use. Spawned rather than forked because
+    the web server has live threads (job workers, Gemini calls) at that point."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = workers
+        return _pool
+
+def discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next get_pool() starts fresh workers"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+            _pool_workers = 0
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def extract_pages_parallel(path: str, page_count: int, workers: Optional[int] = None, start: int = 0) -> List[str]:
+    """Text of page_count pages beginning at page start"""
+    workers = workers or default_worker_count()
+    # A few ranges per worker evens out pages that are much slower than others
+    ranges = split_page_range(page_count, workers * 4)
+    pool = get_pool(workers)
+    try:
+        futures = [pool.submit(extract_page_range, path, start + first, start + last) for first, last in ranges]
+        pages = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
+    except BrokenProcessPool as e:
+        # A worker died (MuPDF crash, OOM kill); replace the pool and read this document serially
+        logger.warning("Extraction pool broke (%s); retrying %s without it", e, path)
+        discard_pool(pool)
+        return extract_page_range(path, start, start + page_count)
@@ -1,29 +1,120 @@
-from langchain_community.document_loaders import PyMuPDFLoader
+import logging
 import pprint
 import os
 import re
-import nltk
-from typing import List, Dict, Any
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+from page_extraction import default_worker_count, extract_pages_parallel
+from classifier import RuleClassifier, get_default_classifier
+from dedup import NearDuplicateFilter
+from chunk_record import ChunkRecord, context_hint
+from lazy_imports import lazy_module
+from segmenter import SentenceSegmenter
+from ingest import UploadBuffer
 
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+fitz = lazy_module('fitz')
+logger = logging.getLogger(__name__)
+
+# A PDF on disk or an upload still held in its UploadBuffer
+PDFSource = Union[str, UploadBuffer]
+# 0-based (start, stop) pages to read; stop is exclusive, None reads to the end
+PageRange = Tuple[int, Optional[int]]
+
+def open_pdf(source: PDFSource):
+    return fitz.open(source) if isinstance(source, str) else source.open_document()
+
+def parse_page_range(value: str) -> Optional[PageRange]:
+    """Parse a 1-based inclusive page range: '5-40', '5-' (to the end), '-40' or '7'"""
+    value = value.strip()
+    if not value:
+        return None
+    match = re.fullmatch(r'(\d*)\s*-\s*(\d*)|(\d+)', value)
+    if not match or match.group(0) == '-':
+        raise ValueError(f"Invalid page range {value!r}, expected e.g. '5-40', '5-' or '7'")
+    if match.group(3):
+        first = last = int(match.group(3))
+    else:
+        first = int(match.group(1) or 1)
+        last = int(match.group(2)) if match.group(2) else None
+    if first < 1 or (last is not None and last < first):
+        raise ValueError(f"Invalid page range {value!r}: pages start at 1 and the range must not be reversed")
+    return first - 1, last
+
+def resolve_page_range(page_count: int, page_range: Optional[PageRange]) -> Tuple[int, int]:
+    if page_range is None:
+        return 0, page_count
+    start, stop = page_range
+    stop = page_count if stop is None else min(stop, page_count)
+    if start >= stop:
+        raise ValueError(f"Page range starts at page {start + 1} but the document has {page_count} pages")
+    return start, stop
+
+# Text normalization patterns, compiled once at import
+_WORD_CHAR_RE = re.compile(r'\w')
+_WHITESPACE_RE = re.compile(r'\s+')
+_HYPHEN_BREAK_RE = re.compile(r'(\w)-\s+(\w)')
+_CAMEL_JOIN_RE = re.compile(r'([a-z])([A-Z])')
+_JUNK_RE = re.compile(r'^(?:\d+$|[A-Z\s]+$|\s*\.+\s*$|\s*-+\s*$|Table \d+|Figure \d+|Page \d+)')
+_HEADER_RE = re.compile(r'\d+\.|[A-Z][A-Z\s]+$|[A-Z][a-z]+:')
+
+ACADEMIC_REPLACEMENTS = {
+    'aforementioned': 'previous',
+    'thus': 'therefore',
+    'hence': 'so',
+    'whilst': 'while',
+    'utilise': 'use',
+    'demonstrate': 'show',
+    'elucidate': 'explain',
+    'commence': 'begin',
+    'terminate': 'end'
+}
+_ACADEMIC_ALTERNATION = '|'.join(ACADEMIC_REPLACEMENTS)
+_ACADEMIC_RE = re.compile(rf'\b(?:{_ACADEMIC_ALTERNATION})\b', re.IGNORECASE)
+
+_YEAR_CITATION = r'\([^)]*\d{4}[^)]*\)'
+_YEAR_CITATION_RE = re.compile(_YEAR_CITATION)
+_NUMBERED_CITATION_RE = re.compile(r'\[\d+\]')
+_SEE_CITATION_RE = re.compile(r'\(see [^)]+\)')
+# Academic words never contain digits or parentheses, so replacing them can't
+# change which year citations match and both can be handled in one pass
+_ACADEMIC_OR_YEAR_RE = re.compile(rf'(?P<citation>{_YEAR_CITATION})|\b(?:{_ACADEMIC_ALTERNATION})\b', re.IGNORECASE)
+
+def _casual_word(formal: str) -> str:
+    casual = ACADEMIC_REPLACEMENTS.get(formal.lower())
+    if casual is None:
+        # IGNORECASE also folds characters like U+017F (long s) that lower() keeps
+        casual = next(v for k, v in ACADEMIC_REPLACEMENTS.items() if re.fullmatch(k, formal, re.IGNORECASE))
+    return casual
+
+def _may_contain_academic(text: str) -> bool:
+    # Plain substring checks are much cheaper than the alternation; only trust
+    # them for ASCII text, where lower() agrees with the regex's case folding
+    if not text.isascii():
+        return True
+    lowered = text.lower()
+    return any(formal in lowered for formal in ACADEMIC_REPLACEMENTS)
+
+def _replace_academic_or_year(match) -> str:
+    return '' if match.group('citation') else _casual_word(match.group(0))
 
 class Util:
+    def __init__(self, classifier: RuleClassifier = None):
+        self.classifier = classifier or get_default_classifier()
+
     def is_meaningful_content(self, chunk: str) -> bool:
         if not chunk or len(chunk.strip()) < 50:
             return False
             
-        clean = re.sub(r'[^\w]', '', chunk)
-        if len(clean) < 10:
+        # Only need to know whether there are at least 10 word characters
+        if sum(1 for _ in islice(_WORD_CHAR_RE.finditer(chunk), 10)) < 10:
             return False
             
         words = chunk.split()
         if len(words) < 5:
             return False
             
-        single_words = sum(1 for word in words if len(word.strip()) == 1)
+        # split() already removed whitespace, so word lengths can be counted in C
+        single_words = list(map(len, words)).count(1)
         if len(words) > 0 and single_words / len(words) > 0.3:
             return False
             
@@ -31,135 +122,62 @@ class Util:
         if references > len(chunk) * 0.15:
             return False
             
-        junk_patterns = [
-            r'^\d+$',
-            r'^[A-Z\s]+$',
-            r'^\s*\.+\s*$',
-            r'^\s*-+\s*$',
-            r'^Table \d+',
-            r'^Figure \d+',
-            r'^Page \d+',
-            r'^\d+$',
-        ]
-        
-        for pattern in junk_patterns:
-            if re.match(pattern, chunk.strip()):
-                return False
+        if _JUNK_RE.match(chunk.strip()):
+            return False
                 
         return True
 
     def fix_artifacts(self, text: str) -> str:
-        text = re.sub(r'(\w)-\s+(\w)', r'\1\2', text)
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+        text = _HYPHEN_BREAK_RE.sub(r'\1\2', text)
+        text = _WHITESPACE_RE.sub(' ', text)
+        text = _CAMEL_JOIN_RE.sub(r'\1 \2', text)
         text = text.strip()
         return text
 
     def normalize_academic_language(self, text: str) -> str:
-        replacements = {
-            'aforementioned': 'previous',
-            'thus': 'therefore',
-            'hence': 'so',
-            'whilst': 'while',
-            'utilise': 'use',
-            'demonstrate': 'show',
-            'elucidate': 'explain',
-            'commence': 'begin',
-            'terminate': 'end'
-        }
-        for formal, casual in replacements.items():
-            text = re.sub(rf'\b{formal}\b', casual, text, flags=re.IGNORECASE)
-        return text
+        if not _may_contain_academic(text):
+            return text
+        return _ACADEMIC_RE.sub(lambda match: _casual_word(match.group(0)), text)
 
     def remove_citations(self, text: str) -> str:
-        text = re.sub(r'\([^)]*\d{4}[^)]*\)', '', text)
-        text = re.sub(r'\[\d+\]', '', text)
-        text = re.sub(r'\(see [^)]+\)', '', text)
-        text = re.sub(r'\s+', ' ', text)
+        text = _YEAR_CITATION_RE.sub('', text)
+        if '[' in text:
+            text = _NUMBERED_CITATION_RE.sub('', text)
+        if '(see' in text:
+            text = _SEE_CITATION_RE.sub('', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         return text.strip()
 
+    def clean_text(self, text: str) -> str:
+        """Equivalent to remove_citations(normalize_academic_language(fix_artifacts(text))).
+
+        Academic words and year citations share one pass, passes that can't
+        match are skipped, and the final whitespace collapse only runs when
+        something was actually removed.
+        """
+        text = _HYPHEN_BREAK_RE.sub(r'\1\2', text)
+        text = _WHITESPACE_RE.sub(' ', text)
+        text = _CAMEL_JOIN_RE.sub(r'\1 \2', text).strip()
+        removed = 0
+        if _may_contain_academic(text):
+            text, removed = _ACADEMIC_OR_YEAR_RE.subn(_replace_academic_or_year, text)
+        elif '(' in text:
+            text, removed = _YEAR_CITATION_RE.subn('', text)
+        if '[' in text:
+            text, count = _NUMBERED_CITATION_RE.subn('', text)
+            removed += count
+        if '(see' in text:
+            text, count = _SEE_CITATION_RE.subn('', text)
+            removed += count
+        if removed:
+            text = _WHITESPACE_RE.sub(' ', text).strip()
+        return text
+
     def detect_topic_type(self, text: str) -> str:
-        text_lower = text.lower()
-        
-        # Historical content detection
-        if any(word in text_lower for word in ['war', 'treaty', 'battle', 'military', 'dictator', 'hitler', 'stalin', 'fascism', 'nazism']):
-            return 'historical_events'
-        
-        # Political content detection  
-        elif any(word in text_lower for word in ['government', 'totalitarian', 'democracy', 'political', 'power', 'control']):
-            return 'political_systems'
-            
-        # Geographic/territorial content
-        elif any(word in text_lower for word in ['europe', 'asia', 'territory', 'country', 'nation', 'japan', 'germany']):
-            return 'geography_politics'
-            
-        # Cause and effect content
-        elif any(word in text_lower for word in ['cause', 'effect', 'result', 'consequence', 'impact', 'led to', 'resulted in']):
-            return 'cause_and_effect'
-            
-        # Economic content
-        elif any(word in text_lower for word in ['economic', 'reparations', 'payment', 'treaty of versailles', 'depression']):
-            return 'economic_factors'
-            
-        # Biographical/people content
-        elif any(word in text_lower for word in ['benito', 'mussolini', 'churchill', 'chamberlain', 'hideki tojo']):
-            return 'historical_figures'
-            
-        # Methodological content
-        elif any(word in text_lower for word in ['method', 'approach', 'procedure', 'design']):
-            return 'methodology'
-            
-        # Results/data content
-        elif any(word in text_lower for word in ['result', 'finding', 'data', 'table', 'figure', 'statistics']):
-            return 'results'
-            
-        # Conclusion content
-        elif any(word in text_lower for word in ['conclusion', 'summary', 'implication', 'future', 'takeaway']):
-            return 'conclusion'
-            
-        # Introduction content  
-        elif any(word in text_lower for word in ['introduction', 'background', 'overview', 'problem', 'context']):
-            return 'introduction'
-            
-        else:
-            return 'general_content'
+        return self.classifier.topic(text.lower())
 
     def determine_slide_type(self, text: str, position: int, total_chunks: int) -> str:
-        text_lower = text.lower()
-        
-        # Check for specific content indicators first
-        if any(phrase in text_lower for phrase in ['the big idea', 'key terms', 'main concept', 'overview']):
-            return 'title'
-        elif any(phrase in text_lower for phrase in ['reading check', 'summarize', 'analyze causes', 'what factors']):
-            return 'analysis'
-        elif any(phrase in text_lower for phrase in ['background', 'context', 'roots in', 'centuries-old']):
-            return 'background'
-        elif any(phrase in text_lower for phrase in ['militarists gain control', 'rise of', 'political control']):
-            return 'historical_development'
-        elif any(phrase in text_lower for phrase in ['treaty of versailles', 'failures of', 'dissatisfied']):
-            return 'causes'
-        elif any(phrase in text_lower for phrase in ['martha gellhorn', 'one american', 'personal account']):
-            return 'personal_story'
-        
-        # Position-based typing as fallback
-        elif position == 0:
-            return 'title'
-        elif position < total_chunks * 0.25:
-            return 'introduction'
-        elif position > total_chunks * 0.75:
-            return 'conclusion'
-        else:
-            # Content-based typing for middle sections
-            if any(word in text_lower for word in ['table', 'figure', 'data', 'result', 'statistics']):
-                return 'data'
-            elif any(word in text_lower for word in ['method', 'procedure', 'approach', 'how', 'process']):
-                return 'methodology'
-            elif any(word in text_lower for word in ['cause', 'reason', 'factor', 'led to', 'resulted in']):
-                return 'causes'
-            elif any(word in text_lower for word in ['effect', 'consequence', 'impact', 'outcome']):
-                return 'effects'
-            else:
-                return 'content'
+        return self.classifier.slide_type(text.lower(), position, total_chunks)
 
     def calculate_complexity_score(self, text: str) -> str:
         words = text.split()
@@ -177,57 +195,88 @@ class Util:
             return 'low'
 
     def generate_ai_context_hint(self, slide_type: str, topic: str) -> str:
-        context_map = {
-            'title': 'Create an engaging title slide that introduces the main topic with clear objectives',
-            'introduction': 'Create an introduction slide providing essential background and context',
-            'background': 'Create a background slide explaining historical context and foundational information',
-            'historical_development': 'Create a slide showing the progression and development of historical events',
-            'causes': 'Create a slide explaining the causes, factors, and reasons that led to events',
-            'effects': 'Create a slide detailing the consequences, impacts, and outcomes',
-            'analysis': 'Create an analytical slide that examines and evaluates key aspects',
-            'personal_story': 'Create a slide featuring personal accounts and human perspectives',
-            'methodology': 'Create a methodology slide explaining approach and methods used',
-            'results': 'Create a results slide with key findings and data points',
-            'data': 'Create a data presentation slide with clear statistics and evidence',
-            'conclusion': 'Create a conclusion slide summarizing main points and takeaways',
-            'content': 'Create a content slide with main ideas and supporting details'
-        }
-        
-        base_context = context_map.get(slide_type, 'Create a slide with main ideas and supporting points')
-        
-        # Add topic-specific guidance
-        if 'historical' in topic.lower() or 'war' in topic.lower():
-            topic_guidance = "Focus on historical events, key figures, dates, and cause-effect relationships"
-        elif 'political' in topic.lower():
-            topic_guidance = "Focus on political systems, government structures, and power dynamics"
-        elif 'economic' in topic.lower():
-            topic_guidance = "Focus on economic factors, financial impacts, and monetary consequences"
-        else:
-            topic_guidance = f"Focus on {topic} with specific details and examples"
-            
-        return f"{base_context}. {topic_guidance}."
+        return context_hint(slide_type, topic)
 
 class PDFProcessor:
     def __init__(self):
         self.util = Util()
+        self.segmenter = SentenceSegmenter()
         self.min_chunk_size = 200
         self.max_chunk_size = 800
+        # Documents at or above this many pages are extracted across a process pool.
+        # 150 is an unmeasured starting point (only single-CPU hosts were available);
+        # run benchmarks/bench_parallel_extraction.py on the target host to tune it
+        self.parallel_page_threshold = int(os.getenv('PDF_PARALLEL_PAGE_THRESHOLD', '150'))
+        self.extraction_workers = default_worker_count()
+        # Bump when extraction or chunking output changes so cached results are invalidated
+        self.extractor_version = 1
+        self.chunker_version = 4
+        # Chunks at least this similar (word-shingle Jaccard) to an earlier one are dropped; 0 disables
+        self.near_duplicate_threshold = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.85'))
+        self.dedup_stats = {'exact_duplicates': 0, 'near_duplicates': 0}
+
+    def extraction_fingerprint(self) -> Dict[str, Any]:
+        return {'extractor_version': self.extractor_version}
+
+    def chunking_fingerprint(self) -> Dict[str, Any]:
+        return {
+            'chunker_version': self.chunker_version,
+            'min_chunk_size': self.min_chunk_size,
+            'max_chunk_size': self.max_chunk_size,
+            'sentence_segmenter': self.segmenter.effective_mode,
+            'near_duplicate_threshold': self.near_duplicate_threshold
+        }
+
+    def iter_pages(self, source: PDFSource, parallel: bool = None,
+                   page_range: Optional[PageRange] = None) -> Iterator[Tuple[int, int, str]]:
+        """Yield (page index, page count, page text) while reading the PDF once.
 
-    def extract_text_from_doc(self, path: str) -> str:
-        loader = PyMuPDFLoader(path)
-        docs = loader.load()
-        total_content = '\n\n'.join([doc.page_content for doc in docs])
-        return total_content
+        With page_range only those pages are read, and index and count are
+        relative to the range. parallel=None picks the process pool
+        automatically for large documents; the pool then extracts windows of
+        parallel_page_threshold pages, yielded as each window finishes, so a
+        consumer that stops early skips the remaining windows. An in-memory
+        upload is spilled to disk first so the workers can open it.
+        """
+        with open_pdf(source) as doc:
+            start, stop = resolve_page_range(doc.page_count, page_range)
+            page_count = stop - start
+            if parallel is None:
+                parallel = self.extraction_workers > 1 and page_count >= self.parallel_page_threshold
+            if not parallel:
+                for index, page in enumerate(doc.pages(start, stop)):
+                    # strip() matches the page_content the old LangChain loader produced
+                    yield index, page_count, page.get_text().strip()
+                return
+        path = source if isinstance(source, str) else source.spill()
+        window = max(self.parallel_page_threshold, self.extraction_workers)
+        index = 0
+        for window_start in range(start, stop, window):
+            size = min(window, stop - window_start)
+            for text in extract_pages_parallel(path, size, self.extraction_workers, start=window_start):
+                yield index, page_count, text
+                index += 1
+
+    def extract_document(self, source: PDFSource, parallel: bool = None,
+                         page_range: Optional[PageRange] = None) -> Tuple[str, int]:
+        """Open the PDF once and return (joined page text, page count)"""
+        page_count = 0
+        pages = []
+        for _, page_count, text in self.iter_pages(source, parallel, page_range):
+            pages.append(text)
+        return '\n\n'.join(pages), page_count
+
+    def extract_text_from_doc(self, source: PDFSource) -> str:
+        return self.extract_document(source)[0]
     
-    def get_page_count(self, path: str) -> int:
-        import fitz
+    def get_page_count(self, source: PDFSource) -> int:
         try:
-            doc = fitz.open(path)
+            doc = open_pdf(source)
             page_count = len(doc)
             doc.close()
             return page_count
         except Exception as e:
-            print(f"Warning: Could not determine page count: {e}")
+            logger.warning("Could not determine page count: %s", e)
             return 0
 
     def smart_split_paragraphs(self, text: str) -> List[str]:
@@ -267,24 +316,10 @@ class PDFProcessor:
         if len(words) > 8:
             return False
         
-        if re.match(r'^\d+\.', line):
-            return True
-        
-        if re.match(r'^[A-Z][A-Z\s]+$', line):
-            return True
-        
-        if re.match(r'^[A-Z][a-z]+:', line):
-            return True
-        
-        return False
+        return _HEADER_RE.match(line) is not None
 
     def split_into_sentences(self, text: str) -> List[str]:
-        try:
-            sentences = nltk.sent_tokenize(text)
-            return [s.strip() for s in sentences if s.strip()]
-        except:
-            sentences = re.split(r'[.!?]+', text)
-            return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
+        return self.segmenter.split(text)
 
     def create_balanced_chunks(self, sentences: List[str]) -> List[str]:
         chunks = []
@@ -304,90 +339,104 @@ class PDFProcessor:
         return chunks
 
     def chunk_text(self, text: str) -> List[str]:
-        paragraphs = self.smart_split_paragraphs(text)
-        all_chunks = []
-        
-        for paragraph in paragraphs:
-            if len(paragraph) <= self.max_chunk_size:
-                if len(paragraph) >= self.min_chunk_size:
-                    all_chunks.append(paragraph)
-                else:
-                    if all_chunks and len(all_chunks[-1]) + len(paragraph) <= self.max_chunk_size:
-                        all_chunks[-1] += " " + paragraph
-                    else:
-                        all_chunks.append(paragraph)
-            else:
-                sentences = self.split_into_sentences(paragraph)
-                chunks = self.create_balanced_chunks(sentences)
-                all_chunks.extend(chunks)
-        
-        final_chunks = []
+        return list(self.iter_chunks([text]))
+
+    def iter_chunks(self, pages: Iterable[str]) -> Iterator[str]:
+        """Yield final chunks as page texts arrive.
+
+        Pages are separated by a blank line in the joined document text, so
+        paragraphs never span pages and each page can be split on its own.
+        The most recent chunk is held back until the next paragraph shows
+        whether a short paragraph will be merged into it.
+        """
         seen_chunks = set()
+        near_duplicates = None
+        if 0 < self.near_duplicate_threshold < 1:
+            near_duplicates = NearDuplicateFilter(self.near_duplicate_threshold)
+        self.dedup_stats = {'exact_duplicates': 0, 'near_duplicates': 0}
+        pending = None
+        
+        for page in pages:
+            paragraphs = self.smart_split_paragraphs(page)
+            # Oversized paragraphs of a page are sentence-split as one batch
+            split_paragraphs = iter(self.segmenter.split_many(
+                [p for p in paragraphs if len(p) > self.max_chunk_size]))
+            for paragraph in paragraphs:
+                if len(paragraph) <= self.max_chunk_size:
+                    if len(paragraph) >= self.min_chunk_size:
+                        new_chunks = [paragraph]
+                    elif pending is not None and len(pending) + len(paragraph) <= self.max_chunk_size:
+                        pending += " " + paragraph
+                        continue
+                    else:
+                        new_chunks = [paragraph]
+                else:
+                    new_chunks = self.create_balanced_chunks(next(split_paragraphs))
+                
+                for chunk in new_chunks:
+                    if pending is not None and self._accept_chunk(pending, seen_chunks, near_duplicates):
+                        yield pending
+                    pending = chunk
         
-        for chunk in all_chunks:
-            chunk_normalized = re.sub(r'\s+', ' ', chunk.strip()).lower()
-            if chunk_normalized not in seen_chunks and self.util.is_meaningful_content(chunk):
-                seen_chunks.add(chunk_normalized)
-                final_chunks.append(chunk)
-        
-        return final_chunks
+        if pending is not None and self._accept_chunk(pending, seen_chunks, near_duplicates):
+            yield pending
+
+    def _accept_chunk(self, chunk: str, seen_chunks: set, near_duplicates: NearDuplicateFilter = None) -> bool:
+        chunk_normalized = _WHITESPACE_RE.sub(' ', chunk.strip()).lower()
+        if chunk_normalized in seen_chunks:
+            self.dedup_stats['exact_duplicates'] += 1
+            return False
+        if not self.util.is_meaningful_content(chunk):
+            return False
+        seen_chunks.add(chunk_normalized)
+        if near_duplicates is not None and near_duplicates.is_duplicate(chunk):
+            # Remembered above too, so later verbatim copies take the cheap exact path
+            self.dedup_stats['near_duplicates'] += 1
+            return False
+        return True
 
-    def clean_and_structure_chunks(self, chunks: List[str]) -> List[Dict[str, Any]]:
+    def clean_and_structure_chunks(self, chunks: List[str], position_span: Optional[int] = None) -> List[ChunkRecord]:
+        """position_span is how many leading chunks position-based slide types are
+        measured against (the deck's chunk budget); by default all of them"""
         structured_chunks = []
+        total_chunks = len(chunks) if position_span is None else min(position_span, len(chunks))
         
         for idx, chunk in enumerate(chunks):
-            cleaned = self.util.fix_artifacts(chunk)
-            cleaned = self.util.normalize_academic_language(cleaned)
-            cleaned = self.util.remove_citations(cleaned)
+            cleaned = self.util.clean_text(chunk)
             
             if not self.util.is_meaningful_content(cleaned):
                 continue
             
-            estimated_topic = self.util.detect_topic_type(cleaned)
-            slide_type = self.util.determine_slide_type(cleaned, idx, len(chunks))
+            estimated_topic, slide_type = self.util.classifier.classify(cleaned, idx, total_chunks)
             complexity = self.util.calculate_complexity_score(cleaned)
             
-            structured_chunk = {
-                "text": cleaned,
-                "estimated_topic": estimated_topic,
-                "slide_type": slide_type,
-                "length": len(cleaned),
-                "complexity": complexity,
-                "ai_context": self.util.generate_ai_context_hint(slide_type, estimated_topic)
-            }
-            structured_chunks.append(structured_chunk)
+            structured_chunks.append(ChunkRecord(cleaned, estimated_topic, slide_type, complexity))
         
         merged_chunks = self._merge_small_chunks(structured_chunks)
-        print(f"\n=== CHUNK MERGING ===")
-        print(f"Before merging: {len(structured_chunks)} chunks")
-        print(f"After merging: {len(merged_chunks)} chunks")
+        logger.debug("Chunk merging: %d -> %d chunks", len(structured_chunks), len(merged_chunks))
         
         return merged_chunks
     
-    def _merge_small_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _merge_small_chunks(self, chunks: List[ChunkRecord]) -> List[ChunkRecord]:
         if len(chunks) <= 1:
             return chunks
         
         merged = []
-        current_chunk = chunks[0].copy()
+        current_chunk = chunks[0]
         
         for next_chunk in chunks[1:]:
-            combined_length = len(current_chunk["text"]) + len(next_chunk["text"])
+            combined_length = current_chunk.length + next_chunk.length
             
             if combined_length <= self.max_chunk_size:
-                current_chunk["text"] += " " + next_chunk["text"]
-                current_chunk["length"] = len(current_chunk["text"])
-                current_chunk["estimated_topic"] = self._merge_topics(
-                    current_chunk["estimated_topic"], 
-                    next_chunk["estimated_topic"]
-                )
-                current_chunk["slide_type"] = self._determine_merged_slide_type(
-                    current_chunk["slide_type"], 
-                    next_chunk["slide_type"]
+                current_chunk = ChunkRecord(
+                    current_chunk.text + " " + next_chunk.text,
+                    self._merge_topics(current_chunk.estimated_topic, next_chunk.estimated_topic),
+                    self._determine_merged_slide_type(current_chunk.slide_type, next_chunk.slide_type),
+                    current_chunk.complexity
                 )
             else:
                 merged.append(current_chunk)
-                current_chunk = next_chunk.copy()
+                current_chunk = next_chunk
         
         merged.append(current_chunk)
         return merged
@@ -412,29 +461,51 @@ class PDFProcessor:
         else:
             return "content"
 
+class MergedChunkCounter:
+    """Counts the chunks clean_and_structure_chunks would return, one raw chunk at a time.
+
+    Merging only looks at cleaned lengths, so each chunk is cleaned once and
+    the count is kept without restructuring everything read so far.
+    """
+
+    def __init__(self, processor: PDFProcessor):
+        self.processor = processor
+        self.closed = 0
+        # Length of the open merge group, None before the first meaningful chunk
+        self.current_length = None
+
+    def add(self, chunk: str):
+        cleaned = self.processor.util.clean_text(chunk)
+        if not self.processor.util.is_meaningful_content(cleaned):
+            return
+        if self.current_length is not None and self.current_length + len(cleaned) <= self.processor.max_chunk_size:
+            self.current_length += len(cleaned) + 1
+            return
+        if self.current_length is not None:
+            self.closed += 1
+        self.current_length = len(cleaned)
+
+    @property
+    def count(self) -> int:
+        return self.closed + (self.current_length is not None)
+
 if __name__ == "__main__":
-    processor = PDFProcessor()
+    # Quick per-stage timing for one or more PDFs; benchmarks/bench_pipeline.py
+    # covers every stage with repeats, percentiles and baseline comparison
+    import sys
+    import time
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.normpath(
-        os.path.join(base_dir, '..', 'public', 'documents', 'test_3.pdf')
-    )
-    
-    if os.path.exists(file_path):
-        print(f"Processing: {file_path}")
-        raw_text = processor.extract_text_from_doc(file_path)
-        print(f"Raw text length: {len(raw_text)} characters")
-        
+    paths = sys.argv[1:] or [os.path.normpath(os.path.join(base_dir, '..', 'public', 'documents', 'test_3.pdf'))]
+    processor = PDFProcessor()
+    for path in paths:
+        start = time.perf_counter()
+        raw_text, page_count = processor.extract_document(path)
+        extracted = time.perf_counter()
         chunks = processor.chunk_text(raw_text)
-        print(f"Generated {len(chunks)} chunks")
-        
+        chunked = time.perf_counter()
         structured_chunks = processor.clean_and_structure_chunks(chunks)
-        print(f"Structured chunks: {len(structured_chunks)}")
-        
-        for i, chunk in enumerate(structured_chunks[:3]):
-            print(f"\nChunk {i+1}:")
-            print(f"  Type: {chunk['slide_type']}")
-            print(f"  Length: {chunk['length']}")
-            print(f"  Text: {chunk['text'][:100]}...")
-    else:
-        print(f"File not found: {file_path}")
-        print(f"Current working directory: {os.getcwd()}")
\ No newline at end of file
+        structured = time.perf_counter()
+        print(f"{os.path.basename(path)}: {page_count} pages, {len(raw_text)} characters, "
+              f"{len(chunks)} chunks, {len(structured_chunks)} structured")
+        print(f"  extract {(extracted - start) * 1000:.1f} ms, chunk {(chunked - extracted) * 1000:.1f} ms, "
+              f"structure {(structured - chunked) * 1000:.1f} ms")
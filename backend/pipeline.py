@@ -0,0 +1,255 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, Tuple
+from pdf_processor import MergedChunkCounter, PageRange, PDFProcessor, PDFSource
+from ai_summarizer import Summarizer
+from pptx_generator import PPTXGenerator
+from document_cache import DocumentCache, get_document_cache
+from artifact_store import ArtifactStore, get_artifact_store
+from chunk_record import ChunkRecord
+from metrics import SLIDES, span
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[str, int, int], None]
+PipelineEvent = Tuple[str, Dict[str, Any]]
+
+class SlidePipeline:
+    """Runs PDFProcessor -> Summarizer -> PPTXGenerator for one uploaded file"""
+
+    STAGES = ['extracting', 'chunking', 'summarizing', 'rendering']
+
+    def __init__(self, cache: Optional[DocumentCache] = None, artifacts: Optional[ArtifactStore] = None,
+                 summarizer_backend: Optional[str] = None, early_stop: Optional[bool] = None):
+        self.processor = PDFProcessor()
+        # Stop extracting once the chunks read so far cover the deck's slide budget
+        self.early_stop = os.getenv('PIPELINE_EARLY_STOP', '1') == '1' if early_stop is None else early_stop
+        self.summarizer = Summarizer(summarizer_backend)
+        self.pptx_generator = PPTXGenerator()
+        self.cache = cache if cache is not None else get_document_cache()
+        self.artifacts = artifacts if artifacts is not None else get_artifact_store()
+
+    def run(self, source: PDFSource, filename: str, on_progress: Optional[ProgressCallback] = None,
+            lineage_id: Optional[str] = None, page_range: Optional[PageRange] = None) -> Dict[str, Any]:
+        for event, data in self.stream(source, filename, lineage_id, page_range):
+            if event == 'progress' and on_progress:
+                on_progress(data['stage'], data['done'], data['total'])
+            elif event == 'done':
+                return data
+        raise RuntimeError('Pipeline finished without a result')
+
+    def stream(self, source: PDFSource, filename: str, lineage_id: Optional[str] = None,
+               page_range: Optional[PageRange] = None) -> Iterator[PipelineEvent]:
+        """Yield ('progress', ...), ('slide', ...) and finally ('done', result) events.
+
+        Slides are emitted as soon as each one is parsed and validated, so the
+        first one arrives after a single LLM round-trip rather than the whole deck.
+
+        lineage_id (default: the filename) names the document across revisions:
+        slides of chunks unchanged since its last upload of the same page
+        range are reused and only new or edited chunks go to the summarizer. page_range limits the deck
+        to those pages, and page_count in the result counts only them.
+        """
+        cache = self.cache
+        cached_tiers = []
+
+        yield self._progress('extracting', 0, 0)
+        # Uploads were hashed while they were received
+        file_hash = DocumentCache.hash_file(source) if isinstance(source, str) else source.sha256
+        text_key = DocumentCache.tier_key(file_hash, self.extraction_fingerprint(page_range))
+        extracted = cache.get_json('text', text_key) if cache else None
+        chunks = None
+        if extracted is None:
+            pages = []
+            page_count = 0
+            with span('extract') as attributes:
+                if self.early_stop:
+                    chunks, page_count = yield from self._extract_within_budget(source, page_range, pages)
+                else:
+                    for index, page_count, text in self.processor.iter_pages(source, page_range=page_range):
+                        pages.append(text)
+                        yield self._progress('extracting', index + 1, page_count)
+                attributes.update(pages=len(pages), page_count=page_count)
+            extracted = {'text': '\n\n'.join(pages), 'page_count': page_count, 'pages_read': len(pages)}
+            if cache:
+                cache.put_json('text', text_key, extracted)
+        else:
+            cached_tiers.append('text')
+            pages = [extracted['text']]
+        raw, page_count = extracted['text'], extracted['page_count']
+        pages_read = extracted.get('pages_read', page_count)
+
+        yield self._progress('chunking', 0, 0)
+        chunks_key = DocumentCache.tier_key(text_key, self.processor.chunking_fingerprint())
+        chunked = cache.get_json('chunks', chunks_key) if cache else None
+        if chunked is None:
+            if chunks is None:
+                with span('chunk') as attributes:
+                    chunks = list(self.processor.iter_chunks(pages))
+                    attributes['chunks'] = len(chunks)
+            # Slide types are positioned within the deck's chunk budget rather than the whole
+            # document, so they don't depend on how many pages an early stop read
+            position_span = self.summarizer.chunk_budget(page_count)
+            with span('structure') as attributes:
+                structured_chunks = self.processor.clean_and_structure_chunks(chunks, position_span)
+                attributes['chunks'] = len(structured_chunks)
+            dedup_stats = dict(self.processor.dedup_stats)
+            if cache:
+                cache.put_json('chunks', chunks_key, {
+                    'chunks': [chunk.to_dict() for chunk in structured_chunks],
+                    'dedup': dedup_stats
+                })
+        else:
+            cached_tiers.append('chunks')
+            structured_chunks = [ChunkRecord.from_dict(chunk) for chunk in chunked['chunks']]
+            dedup_stats = chunked['dedup']
+
+        logger.debug("%s: %d characters, %d of %d pages read, %d chunks, duplicates removed: %s",
+                     filename, len(raw), pages_read, page_count, len(structured_chunks), dedup_stats)
+
+        slides_key = DocumentCache.tier_key(chunks_key, self.summarizer.prompt_fingerprint())
+        slides = cache.get_json('slides', slides_key) if cache else None
+        selected = self.summarizer.select_chunks(structured_chunks, page_count)
+        chunk_hashes = [self.chunk_hash(chunk) for chunk in selected]
+        lineage_id = lineage_id or filename
+        lineage_fingerprint = self.summarizer.prompt_fingerprint()
+        if page_range is not None:
+            # A partial upload must not replace the full document's chunk map
+            lineage_fingerprint['page_range'] = list(page_range)
+        lineage_key = DocumentCache.tier_key(f"lineage:{lineage_id}", lineage_fingerprint)
+        lineage = {'id': lineage_id, 'reused': 0, 'summarized': 0, 'removed': 0}
+        fallbacks = set()
+        if slides is None:
+            # Chunk-level diff against the lineage's previous upload
+            previous = (cache.get_json('lineage', lineage_key) or {}).get('slides', {}) if cache else {}
+            slides = [previous.get(chunk_hash) for chunk_hash in chunk_hashes]
+            pending = [index for index, slide in enumerate(slides) if slide is None]
+            reused = len(slides) - len(pending)
+            lineage.update(reused=reused, summarized=len(pending), removed=len(set(previous) - set(chunk_hashes)))
+            yield self._progress('summarizing', reused, len(slides))
+            if reused:
+                SLIDES.inc(reused, source='lineage')
+                for index, slide in enumerate(slides):
+                    if slide is not None:
+                        yield 'slide', {'index': index, 'total': len(slides), 'slide': slide}
+            with span('summarize', chunks=len(pending), reused=reused):
+                summarized = self.summarizer.iter_slides([selected[index] for index in pending], corpus=selected)
+                for done, (position, slide) in enumerate(summarized, start=reused + 1):
+                    index = pending[position]
+                    slides[index] = slide
+                    yield 'slide', {'index': index, 'total': len(slides), 'slide': slide}
+                    yield self._progress('summarizing', done, len(slides))
+            fallbacks = {pending[position] for position in self.summarizer.last_fallback_indices}
+            # Decks with fallback slides usually mean the API was failing; don't pin them
+            if cache and not fallbacks:
+                cache.put_json('slides', slides_key, slides)
+        else:
+            cached_tiers.append('slides')
+            SLIDES.inc(len(slides), source='cache')
+            for index, slide in enumerate(slides):
+                yield 'slide', {'index': index, 'total': len(slides), 'slide': slide}
+        if cache:
+            # The next revision is diffed against this one; fallback slides are retried then
+            cache.put_json('lineage', lineage_key, {'slides': {
+                chunk_hash: slide for index, (chunk_hash, slide) in enumerate(zip(chunk_hashes, slides))
+                if index not in fallbacks
+            }})
+
+        yield self._progress('rendering', len(slides), len(slides))
+        deck_name = filename.replace('.pdf', '')
+        # Keyed on the slides themselves: decks with fallback slides aren't cached in the
+        # slides tier, so slides_key alone could map different slides to one deck
+        slides_hash = hashlib.sha256(json.dumps(slides, sort_keys=True).encode('utf-8')).hexdigest()
+        pptx_key = DocumentCache.tier_key(slides_hash, self.pptx_generator.render_fingerprint())
+        # The pptx tier only remembers which artifact holds the deck; the bytes live in the artifact store
+        rendered = cache.get_json('pptx', pptx_key) if cache else None
+        artifact_id = rendered['artifact_id'] if rendered else None
+        render_timings = {}
+        if artifact_id is None or not self.artifacts.contains(artifact_id):
+            with span('render', slides=len(slides)):
+                pptx_bytes = self.pptx_generator.render(slides)
+            render_timings = self.pptx_generator.last_timings
+            artifact_id = self.artifacts.put(pptx_bytes)
+            if cache:
+                cache.put_json('pptx', pptx_key, {'artifact_id': artifact_id})
+        else:
+            cached_tiers.append('pptx')
+
+        logger.info("%s: %d/%d pages -> %d chunks -> %d slides (%d reused from lineage %r), artifact %s, cached tiers: %s",
+                    filename, pages_read, page_count, len(structured_chunks), len(slides), lineage['reused'], lineage_id,
+                    artifact_id[:12], ', '.join(cached_tiers) or 'none')
+
+        yield 'done', {
+            'success': True,
+            'filename': filename,
+            'document_hash': file_hash,
+            'page_count': page_count,
+            'pages_read': pages_read,
+            'total_chunks': len(structured_chunks),
+            'duplicates_removed': dedup_stats,
+            'total_slides': len(slides),
+            'slides': slides,
+            'artifact_id': artifact_id,
+            'download_url': f"/api/download-pptx/{deck_name}?artifact={artifact_id}",
+            'render_timings': render_timings,
+            'cached_tiers': cached_tiers,
+            'lineage': lineage
+        }
+
+    def extraction_fingerprint(self, page_range: Optional[PageRange] = None) -> Dict[str, Any]:
+        fingerprint = self.processor.extraction_fingerprint()
+        if page_range is not None:
+            fingerprint['page_range'] = list(page_range)
+        if self.early_stop:
+            # Where extraction stops depends on the chunking config
+            fingerprint['early_stop'] = self.processor.chunking_fingerprint()
+        return fingerprint
+
+    def _extract_within_budget(self, source: PDFSource, page_range: Optional[PageRange],
+                               pages: List[str]) -> Generator[PipelineEvent, None, Tuple[List[str], int]]:
+        """Extract and chunk pages together until the chunks cover the slide budget.
+
+        Appends the text of every page read to pages and returns (raw chunks,
+        page count); pages past the point where select_chunks would cut the
+        deck are never extracted.
+        """
+        state = {'done': 0, 'page_count': 0, 'stop': False}
+        page_iter = self.processor.iter_pages(source, page_range=page_range)
+
+        def pages_until_budget():
+            for index, page_count, text in page_iter:
+                state.update(done=index + 1, page_count=page_count)
+                pages.append(text)
+                yield text
+                if state['stop']:
+                    return
+
+        chunks = []
+        # Structuring merges short chunks, so the budget is checked against the merged count
+        merged = MergedChunkCounter(self.processor)
+        reported_at = 0
+        try:
+            for chunk in self.processor.iter_chunks(pages_until_budget()):
+                chunks.append(chunk)
+                merged.add(chunk)
+                if reported_at < state['done']:
+                    reported_at = state['done']
+                    yield self._progress('extracting', state['done'], state['page_count'])
+                # One past the budget, so the last kept chunk can't merge with later text
+                if merged.count > self.summarizer.chunk_budget(state['page_count']):
+                    state['stop'] = True
+        finally:
+            page_iter.close()
+        yield self._progress('extracting', state['done'], state['page_count'])
+        return chunks, state['page_count']
+
+    @staticmethod
+    def chunk_hash(chunk: ChunkRecord) -> str:
+        """Identity of a chunk's prompt input: its text plus the metadata the prompt uses"""
+        payload = json.dumps([chunk.get('text', ''), chunk.get('slide_type', ''), chunk.get('estimated_topic', '')])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _progress(self, stage: str, done: int, total: int) -> PipelineEvent:
+        return 'progress', {'stage': stage, 'done': done, 'total': total}
@@ -1,61 +1,130 @@
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
+import copy
+import io
 import os
 import tempfile
-from typing import List, Dict, Any
+import threading
+import time
+import zipfile
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+from lazy_imports import lazy_module
+
+if TYPE_CHECKING:
+    from pptx import Presentation
+
+pptx = lazy_module('pptx')
+pptx_util = lazy_module('pptx.util')
+pptx_text = lazy_module('pptx.enum.text')
+pptx_color = lazy_module('pptx.dml.color')
+
+PPTX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+
+_base_template = None
+_base_template_lock = threading.Lock()
+
+def base_template() -> 'Presentation':
+    """Default template with the deck size applied, parsed once per process.
+
+    Never add slides to it; new_presentation() hands out copies.
+    """
+    global _base_template
+    if _base_template is None:
+        with _base_template_lock:
+            if _base_template is None:
+                prs = pptx.Presentation()
+                prs.slide_width = pptx_util.Inches(13.33)
+                prs.slide_height = pptx_util.Inches(7.5)
+                _base_template = prs
+    return _base_template
+
+# Zip entries are written with the current time; a fixed one makes the same
+# slides always produce the same bytes (and so the same artifact id)
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+def normalize_zip(data: bytes) -> bytes:
+    """Re-zip with a fixed timestamp on every entry, keeping order and compression"""
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as source, zipfile.ZipFile(out, 'w') as target:
+        for info in source.infolist():
+            entry = zipfile.ZipInfo(info.filename, date_time=_ZIP_DATE_TIME)
+            entry.compress_type = info.compress_type
+            entry.external_attr = info.external_attr
+            target.writestr(entry, source.read(info))
+    return out.getvalue()
+
+def new_presentation() -> 'Presentation':
+    # A deep copy of the parsed package is ~1.6 ms against ~4.3 ms for re-reading
+    # default.pptx, and saves byte-identical slide parts
+    template = base_template()
+    with _base_template_lock:
+        return copy.deepcopy(template)
 
 class PPTXGenerator:
     def __init__(self):
-        self.title_font_size = Pt(44)
-        self.bullet_font_size = Pt(24)
-        self.title_color = RGBColor(44, 62, 80)
-        self.bullet_color = RGBColor(52, 73, 94)
-        self.accent_color = RGBColor(52, 152, 219)
-        
-    def create_presentation(self, slides_data: List[Dict[str, Any]], filename: str) -> str:
-        prs = Presentation()
+        self.title_font_size = pptx_util.Pt(44)
+        self.bullet_font_size = pptx_util.Pt(24)
+        self.title_color = pptx_color.RGBColor(44, 62, 80)
+        self.bullet_color = pptx_color.RGBColor(52, 73, 94)
+        self.accent_color = pptx_color.RGBColor(52, 152, 219)
+        # Bump when slide styling changes so cached decks are re-rendered
+        self.renderer_version = 1
+        # Milliseconds spent on the last deck: template, build (slides) and save
+        self.last_timings: Dict[str, float] = {}
+
+    def render_fingerprint(self) -> Dict[str, Any]:
+        return {'renderer_version': self.renderer_version}
         
-        self._apply_slide_layout(prs)
+    def render(self, slides_data: List[Dict[str, Any]]) -> bytes:
+        """Render the deck in memory and return the .pptx bytes"""
+        start = time.perf_counter()
+        prs = new_presentation()
+        template_done = time.perf_counter()
         
         for i, slide_data in enumerate(slides_data):
             if i == 0:
                 slide = self._create_title_slide(prs, slide_data)
             else:
                 slide = self._create_content_slide(prs, slide_data)
+        build_done = time.perf_counter()
         
-        temp_dir = tempfile.gettempdir()
-        pptx_path = os.path.join(temp_dir, f"{filename}_slides.pptx")
-        
-        prs.save(pptx_path)
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        data = normalize_zip(buffer.getvalue())
+        save_done = time.perf_counter()
+        self.last_timings = {
+            'template_ms': round((template_done - start) * 1000, 2),
+            'build_ms': round((build_done - template_done) * 1000, 2),
+            'save_ms': round((save_done - build_done) * 1000, 2)
+        }
+        return data
+
+    def create_presentation(self, slides_data: List[Dict[str, Any]], filename: str,
+                            output_dir: Optional[str] = None) -> str:
+        """Render the deck and write it to output_dir (default: the temp dir)"""
+        pptx_path = os.path.join(output_dir or tempfile.gettempdir(), f"{filename}_slides.pptx")
+        data = self.render(slides_data)
+        with open(pptx_path, 'wb') as f:
+            f.write(data)
         return pptx_path
     
-    def _apply_slide_layout(self, prs: Presentation):
-        slide_layout = prs.slide_layouts[6]
-        prs.slide_width = Inches(13.33)
-        prs.slide_height = Inches(7.5)
-    
-    def _create_title_slide(self, prs: Presentation, slide_data: Dict[str, Any]) -> Any:
+    def _create_title_slide(self, prs: 'Presentation', slide_data: Dict[str, Any]) -> Any:
         slide_layout = prs.slide_layouts[0]
         slide = prs.slides.add_slide(slide_layout)
         
         title = slide.shapes.title
         title.text = slide_data.get("title", "Presentation Title")
-        title.text_frame.paragraphs[0].font.size = Pt(48)
+        title.text_frame.paragraphs[0].font.size = pptx_util.Pt(48)
         title.text_frame.paragraphs[0].font.color.rgb = self.title_color
-        title.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+        title.text_frame.paragraphs[0].alignment = pptx_text.PP_ALIGN.CENTER
         
         subtitle = slide.placeholders[1]
         subtitle.text = "Generated by SlideSynth"
-        subtitle.text_frame.paragraphs[0].font.size = Pt(18)
+        subtitle.text_frame.paragraphs[0].font.size = pptx_util.Pt(18)
         subtitle.text_frame.paragraphs[0].font.color.rgb = self.accent_color
-        subtitle.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+        subtitle.text_frame.paragraphs[0].alignment = pptx_text.PP_ALIGN.CENTER
         
         return slide
     
-    def _create_content_slide(self, prs: Presentation, slide_data: Dict[str, Any]) -> Any:
+    def _create_content_slide(self, prs: 'Presentation', slide_data: Dict[str, Any]) -> Any:
         slide_layout = prs.slide_layouts[1]
         slide = prs.slides.add_slide(slide_layout)
         
@@ -79,19 +148,19 @@ class PPTXGenerator:
             p.font.size = self.bullet_font_size
             p.font.color.rgb = self.bullet_color
             p.level = 0
-            p.space_after = Pt(12)
+            p.space_after = pptx_util.Pt(12)
         
         return slide
     
     def _add_slide_number(self, slide: Any, slide_number: int, total_slides: int):
-        left = Inches(11.5)
-        top = Inches(6.5)
-        width = Inches(1.5)
-        height = Inches(0.5)
+        left = pptx_util.Inches(11.5)
+        top = pptx_util.Inches(6.5)
+        width = pptx_util.Inches(1.5)
+        height = pptx_util.Inches(0.5)
         
         txBox = slide.shapes.add_textbox(left, top, width, height)
         tf = txBox.text_frame
         tf.text = f"{slide_number}/{total_slides}"
-        tf.paragraphs[0].font.size = Pt(12)
-        tf.paragraphs[0].font.color.rgb = RGBColor(128, 128, 128)
-        tf.paragraphs[0].alignment = PP_ALIGN.RIGHT
+        tf.paragraphs[0].font.size = pptx_util.Pt(12)
+        tf.paragraphs[0].font.color.rgb = pptx_color.RGBColor(128, 128, 128)
+        tf.paragraphs[0].alignment = pptx_text.PP_ALIGN.RIGHT
@@ -0,0 +1,159 @@
+"""Compact LLM prompts: invariant instructions once, per-chunk content under a budget.
+
+The role, requirements, output format and the default (content) slide
+guidance never change between chunks, so they are sent as the request's
+system instruction instead of being pasted into every prompt; being an
+identical prefix, they also qualify for Gemini's implicit caching once a
+request is long enough. The per-chunk prompt carries only what is
+specific to the chunk: guidance for a non-default slide type (once per
+type in a batch), the text trimmed so the request stays within the input
+token budget, and key concepts only for text that had to be cut.
+"""
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+SLIDE_TYPE_GUIDANCE = {
+    'title': "introduce the main topic and key themes; bullets outline what is covered or the objectives",
+    'introduction': "give background and context, why the topic matters, and set up the main argument",
+    'content': "main ideas and supporting details, most important first, with specific facts or examples",
+    'methodology': "explain approaches and methods as clear steps with the tools or frameworks used; focus on how, not what",
+    'results': "key findings first, with specific data or evidence and cause-and-effect where relevant",
+    'conclusion': "summarize and connect the main points, their implications, and key takeaways or next steps",
+    'data': "present the numbers clearly and explain what they mean, comparing data points where relevant",
+    'analysis': "break the question down into its factors and explain how each contributes, with supporting evidence",
+    'background': "give the context and roots of the topic that the rest of the material builds on",
+    'historical_development': "trace how the situation developed step by step, naming the key actors and turning points",
+    'causes': "identify the main causes and explain how each led to the outcome, most significant first",
+    'effects': "describe the main consequences and their impact, separating immediate from long-term effects",
+    'personal_story': "tell the individual's account concretely and connect it to the wider events it illustrates"
+}
+
+def guidance_for(slide_type: str) -> str:
+    """Guidance for a slide type; labels from custom classifier rules get the content guidance"""
+    return SLIDE_TYPE_GUIDANCE.get(slide_type, SLIDE_TYPE_GUIDANCE['content'])
+
+REQUIREMENTS = """REQUIREMENTS:
+1. A specific, descriptive title (NOT generic like "Summary" or "Overview")
+2. 3-5 clear, concise bullet points, each one complete idea
+3. Focus on the most important information, in active voice, with logical flow between bullets
+4. Use only the content given for the slide"""
+
+SLIDE_FORMAT = '{"title": "Specific descriptive title", "bullets": ["First key point", "Second key point", "Third key point"]}'
+
+# Words of a capitalized phrase that say nothing about the chunk
+_CONCEPT_STOPWORDS = frozenset(['The', 'This', 'That', 'They', 'There', 'These', 'Those'])
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+class PromptCompiler:
+    """Builds system instructions and per-chunk prompts for Summarizer.
+
+    input_token_budget (GEMINI_INPUT_TOKEN_BUDGET) caps the estimated input
+    tokens of a single-chunk request, system instruction included; longer
+    chunks are cut at a sentence boundary and the key concepts of the cut
+    text are listed instead.
+    """
+
+    VERSION = 2
+    # Content label, closing line and the key concepts of cut text
+    PROMPT_OVERHEAD_TOKENS = 30
+
+    def __init__(self, input_token_budget: Optional[int] = None):
+        if input_token_budget is None:
+            input_token_budget = int(os.getenv('GEMINI_INPUT_TOKEN_BUDGET', '1500'))
+        self.input_token_budget = input_token_budget
+        guidance = f"Unless a SLIDE TYPE is given: {SLIDE_TYPE_GUIDANCE['content']}."
+        self._system_instruction = (
+            "You are an expert presentation designer. Create one professional slide from the content "
+            f"of each request.\n\n{REQUIREMENTS}\n{guidance}\n\n"
+            f"Reply with JSON only:\n{SLIDE_FORMAT}"
+        )
+        self._batch_system_instruction = (
+            "You are an expert presentation designer. Create one professional slide for EACH numbered "
+            f"content item of a request.\n\n{REQUIREMENTS}\n{guidance}\n\n"
+            "Reply with JSON only, an array with one object per item in item order:\n"
+            f'[{SLIDE_FORMAT[:1]}"id": 0, {SLIDE_FORMAT[1:]}]'
+        )
+
+    def fingerprint(self) -> Dict[str, object]:
+        return {'compiler': self.VERSION, 'input_token_budget': self.input_token_budget}
+
+    def system_instruction(self, batch: bool = False) -> str:
+        return self._batch_system_instruction if batch else self._system_instruction
+
+    def text_budget(self, batch: bool = False) -> int:
+        """Tokens left for a chunk's header and text in a single-chunk request"""
+        return max(50, self.input_token_budget - self.estimate_tokens(self.system_instruction(batch))
+                   - self.PROMPT_OVERHEAD_TOKENS)
+
+    def compile(self, chunk: Dict[str, object]) -> Tuple[str, bool]:
+        """Prompt for one chunk and whether its text had to be cut to fit the budget"""
+        body, truncated = self._chunk_body(chunk, self.text_budget(), with_guidance=True)
+        return f"{body}\n\nCreate the slide now:", truncated
+
+    def compile_batch(self, chunks: List[Dict[str, object]]) -> Tuple[str, int]:
+        """Prompt for several chunks and how many of them were cut"""
+        items, truncated = [], 0
+        budget = self.text_budget(batch=True)
+        for position, chunk in enumerate(chunks):
+            body, cut = self._chunk_body(chunk, budget)
+            truncated += cut
+            items.append(f"ITEM {position}\n{body}")
+        # Guidance for each non-default slide type once, however many items share it
+        slide_types = []
+        for chunk in chunks:
+            slide_type = chunk.get('slide_type', 'content')
+            if slide_type != 'content' and slide_type not in slide_types:
+                slide_types.append(slide_type)
+        guidance = ''.join(f"{slide_type.upper()} slides: {guidance_for(slide_type)}\n" for slide_type in slide_types)
+        if guidance:
+            guidance += '\n'
+        return guidance + '\n\n'.join(items) + f"\n\nCreate exactly {len(chunks)} slides now:", truncated
+
+    def _chunk_body(self, chunk: Dict[str, object], budget: int, with_guidance: bool = False) -> Tuple[str, bool]:
+        lines = []
+        slide_type = chunk.get('slide_type', 'content')
+        if slide_type != 'content':
+            if with_guidance:
+                lines.append(f"SLIDE TYPE: {slide_type} ({guidance_for(slide_type)})")
+            else:
+                lines.append(f"SLIDE TYPE: {slide_type}")
+        topic = chunk.get('estimated_topic', 'general')
+        if topic != 'general':
+            lines.append(f"TOPIC AREA: {topic}")
+        text = str(chunk.get('text', ''))
+        kept, truncated = self.fit_text(text, budget - sum(self.estimate_tokens(line) for line in lines))
+        if truncated:
+            # Only concepts the model can no longer see in the kept text add anything
+            concepts = [concept for concept in self.key_concepts(text) if concept not in kept]
+            if concepts:
+                lines.append(f"ALSO COVERED LATER IN THE SECTION: {', '.join(concepts)}")
+        lines.append(f"CONTENT:\n{kept}")
+        return '\n'.join(lines), truncated
+
+    def fit_text(self, text: str, budget: int) -> Tuple[str, bool]:
+        """Longest prefix of whole sentences within budget tokens (whole words if one sentence is too long)"""
+        if self.estimate_tokens(text) <= budget:
+            return text, False
+        max_chars = budget * 4
+        kept = ''
+        for sentence in _SENTENCE_END.split(text):
+            candidate = f"{kept} {sentence}" if kept else sentence
+            if len(candidate) > max_chars:
+                break
+            kept = candidate
+        if not kept:
+            kept = text[:max_chars].rsplit(' ', 1)[0]
+        return kept, True
+
+    def key_concepts(self, text: str, limit: int = 5) -> List[str]:
+        """Most frequent capitalized phrases in the text"""
+        phrases = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', text)
+        counts = Counter(phrase for phrase in phrases if len(phrase) > 3 and phrase not in _CONCEPT_STOPWORDS)
+        return [phrase for phrase, _ in counts.most_common(limit)]
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        # Roughly 4 characters per token for English prose
+        return len(text) // 4 + 1
@@ -0,0 +1,105 @@
+"""Backends Summarizer can turn chunks into slides with.
+
+'gemini' sends prompts through the shared Gemini client, 'mock' answers
+them locally with a configurable delay (offline runs, load tests,
+benchmarks) and 'extractive' skips prompts entirely and picks sentences
+with TextRank (fast mode). LLM backends expose generate_content() like
+genai's client.models, so Summarizer's caching, retries and parsing apply
+to all of them.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+from extractive import ExtractiveSummarizer
+from gemini_client import genai_types, get_client, load_env
+
+logger = logging.getLogger(__name__)
+
+class SummarizerBackend:
+    name = ''
+    # False for backends that build slides from chunk text without prompting a model
+    uses_llm = True
+
+    def generate_content(self, model: str, contents: str, config: Any = None) -> Any:
+        """Answer one prompt; the result has .text and .usage_metadata like a genai response"""
+        raise NotImplementedError
+
+    def fingerprint(self) -> Dict[str, Any]:
+        return {'backend': self.name}
+
+class GeminiBackend(SummarizerBackend):
+    name = 'gemini'
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.client = get_client(api_key)
+
+    def generate_content(self, model: str, contents: str, config: Any = None) -> Any:
+        if isinstance(config, dict):
+            config = genai_types.GenerateContentConfig(**config)
+        return self.client.models.generate_content(model=model, contents=contents, config=config)
+
+class MockBackend(SummarizerBackend):
+    """Deterministic local stand-in for Gemini.
+
+    Answers every prompt with a valid slide built from the prompt's own
+    words after sleeping latency_ms (MOCK_LLM_LATENCY_MS), and reports token
+    counts the way the API's usage_metadata does.
+    """
+
+    name = 'mock'
+
+    def __init__(self, latency_ms: Optional[float] = None):
+        if latency_ms is None:
+            latency_ms = float(os.getenv('MOCK_LLM_LATENCY_MS', '0'))
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    def generate_content(self, model: str, contents: str, config: Any = None) -> Any:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        system_instruction = (config or {}).get('system_instruction') or ''
+        return SimpleNamespace(text=self.reply(contents), usage_metadata=SimpleNamespace(
+            prompt_token_count=(len(system_instruction) + len(contents)) // 4 + 1, candidates_token_count=60))
+
+    @staticmethod
+    def reply(prompt: str) -> str:
+        words = [word.strip('.,:;"\'()') for word in prompt.split() if len(word) > 3]
+        seed = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8], 16)
+        pick = lambda offset, count: ' '.join(words[(seed + offset) % len(words):][:count]) or 'Summary'
+        return json.dumps({
+            'title': pick(0, 5).title()[:60],
+            'bullets': [f"{pick(7 * i + 3, 8).capitalize()} in this section" for i in range(4)]
+        })
+
+class ExtractiveBackend(SummarizerBackend):
+    name = 'extractive'
+    uses_llm = False
+
+    def __init__(self, engine: Optional[ExtractiveSummarizer] = None):
+        self.engine = engine or ExtractiveSummarizer()
+
+    def fingerprint(self) -> Dict[str, Any]:
+        return {'backend': self.name, **self.engine.fingerprint()}
+
+BACKENDS = {'gemini': GeminiBackend, 'mock': MockBackend, 'extractive': ExtractiveBackend}
+
+def create_backend(name: Optional[str] = None) -> SummarizerBackend:
+    """Backend by name (default: SUMMARIZER_BACKEND, else gemini when GEMINI_API_KEY is set)
+
+    Without an API key a gemini request degrades to the extractive backend
+    instead of failing, so the app still produces decks offline.
+    """
+    load_env()
+    name = name or os.getenv('SUMMARIZER_BACKEND') or ('gemini' if os.getenv('GEMINI_API_KEY') else 'extractive')
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown summarizer backend {name!r}, expected one of {sorted(BACKENDS)}")
+    if name == 'gemini' and not os.getenv('GEMINI_API_KEY'):
+        logger.warning("GEMINI_API_KEY is not set; using the extractive summarizer")
+        name = 'extractive'
+    return BACKENDS[name]()
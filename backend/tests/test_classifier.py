@@ -0,0 +1,73 @@
+import ast
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classifier import DEFAULT_RULES, KeywordMatcher, RuleClassifier
+
+FIXTURES = os.path.dirname(os.path.abspath(__file__))
+
+def scan_first_match(table, text_lower):
+    """The per-keyword substring scan the automaton replaces"""
+    for label, keywords in table:
+        if any(keyword in text_lower for keyword in keywords):
+            return label
+    return None
+
+def scan_classify(classifier, text, position, total_chunks):
+    text_lower = text.lower()
+    topic = scan_first_match(classifier.topic_rules, text_lower) or classifier.default_topic
+    slide_type = scan_first_match(classifier.content_rules, text_lower)
+    if not slide_type:
+        if position == 0:
+            slide_type = 'title'
+        elif position < total_chunks * 0.25:
+            slide_type = 'introduction'
+        elif position > total_chunks * 0.75:
+            slide_type = 'conclusion'
+        else:
+            slide_type = scan_first_match(classifier.middle_rules, text_lower) or classifier.middle_default
+    return topic, slide_type
+
+def fixture_texts():
+    texts = []
+    for name in ('test1.txt', 'test3.txt'):
+        with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+            texts.extend(chunk['text'] for chunk in ast.literal_eval(f.read()))
+    return texts
+
+EDGE_TEXTS = [
+    '',
+    'The treaty was signed.',
+    'The Treaty of Versailles left Germany dissatisfied.',
+    'This result resulted in a new table.',
+    'Show the figures.',
+    'Overall it was a process, not a method.',
+    'Civil war broke out; the rise of militarists followed.',
+    'Ökonomische Folgen – the economic impact of reparations?',
+    '日本 (Japan) and the war in Asia',
+]
+
+def test_classify_matches_substring_scan_on_fixtures():
+    classifier = RuleClassifier()
+    texts = fixture_texts() + EDGE_TEXTS
+    for position, text in enumerate(texts):
+        assert classifier.classify(text, position, len(texts)) == scan_classify(classifier, text, position, len(texts))
+
+def test_classify_matches_substring_scan_on_every_slice():
+    # Slices start and end inside words, where overlapping keywords differ
+    classifier = RuleClassifier()
+    text = ' '.join(EDGE_TEXTS) + ' ' + fixture_texts()[0]
+    for start in range(0, len(text), 37):
+        for length in (5, 13, 40, 200):
+            piece = text[start:start + length]
+            assert classifier.classify(piece, 40, 80) == scan_classify(classifier, piece, 40, 80)
+
+def test_matcher_finds_every_keyword_the_scan_finds():
+    keywords = {keyword for section in DEFAULT_RULES['topic']['rules'] for keyword in section[1]}
+    keywords.update(['he', 'she', 'hers', 'his', 'a?b', 'ü', '日本', ''])
+    matcher = KeywordMatcher(keywords)
+    for text in fixture_texts() + EDGE_TEXTS + ['ushers', 'a?b', 'ahishers']:
+        text_lower = text.lower()
+        assert matcher.find(text_lower) == {keyword for keyword in keywords if keyword in text_lower}
@@ -13,8 +13,20 @@ interface UploadResponse {
   total_slides: number;
   slides: Slide[];
   pptx_path?: string;
+  download_url?: string;
 }
 
+interface JobStatus {
+  job_id: string;
+  status: "queued" | "running" | "succeeded" | "failed";
+  stage: string;
+  progress: { done: number; total: number; percent: number | null };
+  result?: UploadResponse;
+  error?: string;
+}
+
+const JOB_POLL_INTERVAL_MS = 1000;
+
 type ProcessingState =
   | "idle"
   | "uploading"
@@ -31,6 +43,7 @@ const App = () => {
   const [currentSlideIndex, setCurrentSlideIndex] = useState(0);
   const [uploadProgress, setUploadProgress] = useState<string>("");
   const [filename, setFilename] = useState<string>("");
+  const [downloadUrl, setDownloadUrl] = useState<string>("");
   const fileInputRef = useRef<HTMLInputElement>(null);
 
   const handleUpload = async (e: React.ChangeEvent<HTMLInputElement>) => {
@@ -46,6 +59,7 @@ const App = () => {
     setSlides([]);
     setCurrentSlideIndex(0);
     setFilename(file.name);
+    setDownloadUrl("");
 
     const formData = new FormData();
     formData.append("file", file);
@@ -59,17 +73,38 @@ const App = () => {
         body: formData,
       });
 
-      if (!res.ok) {
+      if (res.status !== 202) {
         throw new Error(`Upload failed: ${res.status}`);
       }
 
-      setProcessingState("generating");
-      setUploadProgress("Generating slides with AI...");
+      const { status_url } = await res.json();
+      let job: JobStatus;
+      for (;;) {
+        await new Promise((r) => setTimeout(r, JOB_POLL_INTERVAL_MS));
+        const statusRes = await fetch(status_url);
+        if (!statusRes.ok) {
+          throw new Error(`Status check failed: ${statusRes.status}`);
+        }
+        job = await statusRes.json();
+        if (job.status === "failed") {
+          throw new Error(job.error || "Processing failed");
+        }
+        if (job.status === "succeeded") {
+          break;
+        }
+        if (job.stage === "summarizing" && job.progress.total) {
+          setProcessingState("generating");
+          setUploadProgress(
+            `Generating slides with AI... (${job.progress.done}/${job.progress.total})`
+          );
+        }
+      }
 
-      const result: UploadResponse = await res.json();
+      const result = job.result as UploadResponse;
 
       if (result.success && result.slides) {
         setSlides(result.slides);
+        setDownloadUrl(result.download_url || "");
         setProcessingState("success");
         setUploadProgress(
           `Successfully generated ${result.total_slides} slides from ${result.filename}`
@@ -90,7 +125,9 @@ const App = () => {
 
     try {
       const cleanFilename = filename.replace(".pdf", "");
-      const response = await fetch(`/api/download-pptx/${cleanFilename}`);
+      const response = await fetch(
+        downloadUrl || `/api/download-pptx/${cleanFilename}`
+      );
 
       if (response.ok) {
         const blob = await response.blob();